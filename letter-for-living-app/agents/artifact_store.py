@@ -0,0 +1,114 @@
+from pathlib import Path
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+
+from agents.media_cache import file_digest, touch
+
+
+DIGEST_RE = re.compile(r"\b[0-9a-f]{64}\b")
+
+
+def blob_path(store_dir: Path, digest: str, suffix: str = "") -> Path:
+    return store_dir / digest[:2] / f"{digest}{suffix.lower()}"
+
+
+def store_file(
+    store_dir: Path,
+    src: Path,
+    suffix: str | None = None,
+    move: bool = False,
+    digest: str | None = None,
+) -> Path:
+    if not src.exists():
+        raise RuntimeError(f"저장할 파일이 없습니다: {src}")
+    digest = digest or file_digest(src)
+    dest = blob_path(store_dir, digest, src.suffix if suffix is None else suffix)
+    if dest.exists():
+        touch(dest)
+        if move and src.resolve() != dest.resolve():
+            src.unlink(missing_ok=True)
+        return dest
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.part")
+    if move:
+        try:
+            os.replace(src, tmp_path)
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+            src.unlink(missing_ok=True)
+    else:
+        shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dest)
+    return dest
+
+
+def store_bytes(store_dir: Path, data: bytes, suffix: str) -> Path:
+    store_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = store_dir / f".incoming.{os.getpid()}.{time.time_ns()}{suffix}"
+    tmp_path.write_bytes(data)
+    return store_file(store_dir, tmp_path, suffix=suffix, move=True)
+
+
+def collect_references(paths: list[Path]) -> set[str]:
+    """Return every digest mentioned in the given files.
+
+    Raises OSError or ValueError when an existing file cannot be read or a
+    .json file does not parse, so callers never collect garbage from an
+    incomplete reference set.
+    """
+    referenced: set[str] = set()
+    for path in paths:
+        if not path.is_file():
+            continue
+        text = path.read_text(encoding="utf-8")
+        if path.suffix == ".json":
+            json.loads(text)
+        referenced.update(DIGEST_RE.findall(text))
+    return referenced
+
+
+def iter_blobs(store_dir: Path):
+    if not store_dir.exists():
+        return
+    for shard in store_dir.iterdir():
+        if not shard.is_dir():
+            continue
+        for path in shard.iterdir():
+            if path.is_file() and not path.name.startswith("."):
+                yield path
+
+
+def garbage_collect(
+    store_dir: Path,
+    referenced: set[str],
+    max_bytes: int,
+    grace_seconds: float = 3600.0,
+) -> dict:
+    now = time.time()
+    blobs = []
+    total = 0
+    for path in iter_blobs(store_dir):
+        stat = path.stat()
+        last_used = max(stat.st_mtime, stat.st_atime)
+        blobs.append((last_used, stat.st_size, path))
+        total += stat.st_size
+    removed: list[str] = []
+    freed = 0
+    # Only unreferenced blobs older than the grace period are candidates,
+    # least recently used first, until the store fits in the quota.
+    for last_used, size, path in sorted(blobs, key=lambda item: item[0]):
+        if total - freed <= max_bytes:
+            break
+        if path.name[:64] in referenced or now - last_used < grace_seconds:
+            continue
+        path.unlink(missing_ok=True)
+        removed.append(str(path))
+        freed += size
+    for shard in store_dir.iterdir() if store_dir.exists() else []:
+        if shard.is_dir() and not any(shard.iterdir()):
+            shard.rmdir()
+    return {"total_bytes": total - freed, "freed_bytes": freed, "removed": removed}
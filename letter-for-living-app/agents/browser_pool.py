@@ -0,0 +1,272 @@
+from contextlib import contextmanager
+from pathlib import Path
+import os
+import shutil
+import threading
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+
+from agents.profile_clones import sync_profile
+
+
+DEFAULT_MAX_USES = 20
+
+CHROME_CANDIDATES = [
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    "/Applications/Google Chrome for Testing.app/Contents/MacOS/Google Chrome for Testing",
+    "/Applications/Chromium.app/Contents/MacOS/Chromium",
+    "/usr/bin/google-chrome",
+    "/usr/bin/google-chrome-stable",
+    "/usr/bin/chromium",
+    "/usr/bin/chromium-browser",
+    "/snap/bin/chromium",
+    "/opt/google/chrome/chrome",
+]
+CHROME_COMMANDS = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+# Chrome for Testing builds downloaded by Selenium Manager or Puppeteer.
+CHROME_CACHE_GLOBS = (
+    ".cache/selenium/chrome/*/*/chrome",
+    ".cache/puppeteer/chrome/*/chrome-linux64/chrome",
+)
+
+# One warm Chrome per profile directory. A profile can only be opened by a
+# single Chrome process, so each entry also serialises the uploads using it.
+_POOL: dict[str, dict] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _profile_in_use(profile_dir: Path) -> bool:
+    # SingletonLock is a symlink to "<host>-<pid>"; a crashed Chrome leaves
+    # it behind, so only a lock whose process is still alive counts.
+    lock_path = profile_dir / "SingletonLock"
+    if not lock_path.is_symlink() and not lock_path.exists():
+        return False
+    try:
+        pid = int(os.readlink(lock_path).rsplit("-", 1)[-1])
+        os.kill(pid, 0)
+    except (OSError, ValueError):
+        lock_path.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def find_chrome_binary() -> str:
+    override = os.environ.get("LFL_CHROME_BIN", "").strip()
+    if override:
+        return override if Path(override).exists() else ""
+    for path in CHROME_CANDIDATES:
+        if Path(path).exists():
+            return path
+    for command in CHROME_COMMANDS:
+        path = shutil.which(command)
+        if path:
+            return path
+    for pattern in CHROME_CACHE_GLOBS:
+        found = sorted(Path.home().glob(pattern))
+        if found:
+            return str(found[-1])
+    return ""
+
+
+def find_chromedriver() -> str:
+    override = os.environ.get("LFL_CHROMEDRIVER", "").strip()
+    if override:
+        return override if Path(override).exists() else ""
+    return shutil.which("chromedriver") or ""
+
+
+def create_driver(profile_dir: str, project_root: Path, headless: bool = False):
+    driver_path = find_chromedriver()
+    if not driver_path:
+        raise RuntimeError("chromedriver를 찾을 수 없습니다. 설치 후 다시 시도해 주세요.")
+
+    options = webdriver.ChromeOptions()
+    chrome_bin = find_chrome_binary()
+    if chrome_bin:
+        options.binary_location = chrome_bin
+    else:
+        raise RuntimeError("Chrome 브라우저를 찾을 수 없습니다. Chrome 설치 후 다시 시도해 주세요.")
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1280,1600")
+        options.add_argument("--disable-dev-shm-usage")
+        if hasattr(os, "geteuid") and os.geteuid() == 0:
+            options.add_argument("--no-sandbox")
+    else:
+        options.add_experimental_option("detach", True)
+
+    if profile_dir:
+        Path(profile_dir).mkdir(parents=True, exist_ok=True)
+        if _profile_in_use(Path(profile_dir)):
+            raise RuntimeError(
+                "Chrome 프로필이 다른 창에서 사용 중입니다. "
+                "모든 Chrome 창을 닫고 다시 시도해 주세요."
+            )
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        options.add_argument("--no-first-run")
+        options.add_argument("--no-default-browser-check")
+
+    log_path = project_root / "logs" / "chromedriver.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    service = Service(driver_path, log_output=str(log_path))
+    return webdriver.Chrome(service=service, options=options)
+
+
+def start_driver(profile_dir: str, project_root: Path, headless: bool, template_dir: str = ""):
+    # A working clone picks up the template's latest login before Chrome
+    # opens it; a running Chrome keeps the session it started with.
+    if template_dir:
+        sync_profile(template_dir, profile_dir)
+    return create_driver(profile_dir, project_root, headless)
+
+
+def driver_alive(driver) -> bool:
+    if driver is None:
+        return False
+    # The user may close the tab a finished post was left in; Chrome is
+    # still usable as long as any window remains.
+    try:
+        return bool(driver.window_handles)
+    except WebDriverException:
+        return False
+
+
+def quit_driver(driver) -> None:
+    if driver is None:
+        return
+    try:
+        driver.quit()
+    except WebDriverException:
+        pass
+
+
+def clear_tab(driver) -> None:
+    # Blank the current tab without a pending "leave page?" prompt.
+    driver.execute_script("window.onbeforeunload = null;")
+    driver.get("about:blank")
+    try:
+        driver.switch_to.alert.accept()
+    except WebDriverException:
+        pass
+
+
+def reset_driver(driver) -> None:
+    # Back to a single blank tab, so the next upload starts from a fresh
+    # editor load. Only for headless Chrome, where nobody reviews the posts.
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    clear_tab(driver)
+
+
+def open_post_tab(driver, post_tabs: set) -> None:
+    # Visible Chrome keeps every earlier post open in its own tab until the
+    # user publishes and closes it; the next post gets a tab nobody wrote in.
+    handles = driver.window_handles
+    post_tabs.intersection_update(handles)
+    spare = [handle for handle in handles if handle not in post_tabs]
+    if spare:
+        driver.switch_to.window(spare[0])
+        clear_tab(driver)
+    else:
+        driver.switch_to.new_window("tab")
+    post_tabs.add(driver.current_window_handle)
+
+
+def _has_open_posts(driver, post_tabs: set) -> bool:
+    try:
+        return bool(post_tabs.intersection(driver.window_handles))
+    except WebDriverException:
+        return False
+
+
+def _pool_entry(profile_dir: str) -> dict:
+    with _POOL_LOCK:
+        return _POOL.setdefault(
+            profile_dir,
+            {
+                "driver": None,
+                "uses": 0,
+                "headless": False,
+                "post_tabs": set(),
+                "lock": threading.Lock(),
+            },
+        )
+
+
+@contextmanager
+def lease_driver(
+    profile_dir: str,
+    project_root: Path,
+    max_uses: int = DEFAULT_MAX_USES,
+    headless: bool = False,
+    reset: bool = True,
+    template_dir: str = "",
+):
+    entry = _pool_entry(profile_dir)
+    with entry["lock"]:
+        driver = entry["driver"]
+        fresh = False
+        # A visible Chrome still holding unpublished posts is never recycled;
+        # it is replaced once the user has closed those tabs.
+        worn_out = entry["uses"] >= max_uses and (
+            headless or not _has_open_posts(driver, entry["post_tabs"])
+        )
+        if not driver_alive(driver) or worn_out or entry["headless"] != headless:
+            quit_driver(driver)
+            entry["driver"] = None
+            driver = start_driver(profile_dir, project_root, headless, template_dir)
+            entry.update(driver=driver, uses=0, headless=headless, post_tabs=set())
+            fresh = True
+        if reset:
+            try:
+                if headless:
+                    if not fresh:
+                        reset_driver(driver)
+                else:
+                    open_post_tab(driver, entry["post_tabs"])
+            except WebDriverException:
+                quit_driver(driver)
+                driver = start_driver(profile_dir, project_root, headless, template_dir)
+                entry.update(driver=driver, uses=0, post_tabs=set())
+                if not headless:
+                    open_post_tab(driver, entry["post_tabs"])
+        entry["uses"] += 1
+        try:
+            yield driver
+        except Exception:
+            if not driver_alive(driver):
+                quit_driver(driver)
+                entry["driver"] = None
+            raise
+
+
+def warm_driver(
+    profile_dir: str,
+    project_root: Path,
+    url: str = "",
+    headless: bool = False,
+    template_dir: str = "",
+) -> None:
+    entry = _pool_entry(profile_dir)
+    if driver_alive(entry["driver"]) or not entry["lock"].acquire(blocking=False):
+        return
+    try:
+        driver = start_driver(profile_dir, project_root, headless, template_dir)
+        entry.update(driver=driver, uses=0, headless=headless)
+        if url:
+            driver.get(url)
+    finally:
+        entry["lock"].release()
+
+
+def shutdown_pool(headless_only: bool = False) -> None:
+    with _POOL_LOCK:
+        keys = [key for key, entry in _POOL.items() if entry["headless"] or not headless_only]
+        entries = [_POOL.pop(key) for key in keys]
+    for entry in entries:
+        quit_driver(entry["driver"])
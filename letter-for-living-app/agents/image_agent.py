@@ -1,9 +1,16 @@
-import base64
 import datetime as dt
 from pathlib import Path
 
 import requests
 
+from agents.image_pipeline import (
+    IMAGE_FORMATS,
+    UPLOAD_CHUNK_SIZE,
+    ensure_image_format,
+    image_format_request,
+    stream_image_response,
+)
+
 
 def build_image_prompt(result: dict) -> str:
     theme = result.get("theme_display", "") or result.get("theme_en", "")
@@ -18,28 +25,34 @@ def build_image_prompt(result: dict) -> str:
     )
 
 
-def generate_image(prompt: str, image_dir: Path, api_key: str, size: str = "1536x1024") -> Path:
+def generate_image(
+    prompt: str,
+    image_dir: Path,
+    api_key: str,
+    size: str = "1536x1024",
+    output_format: str = "jpeg",
+    output_compression: int | None = 85,
+) -> Path:
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is not set")
     payload = {
         "model": "gpt-image-1",
         "prompt": prompt,
         "size": size,
+        **image_format_request(output_format, output_compression),
     }
-    resp = requests.post(
+    timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
+    img_path = image_dir / f"poster_{timestamp}{IMAGE_FORMATS[output_format]}"
+    with requests.post(
         "https://api.openai.com/v1/images/generations",
         headers={"Authorization": f"Bearer {api_key}"},
         json=payload,
         timeout=120,
-    )
-    if resp.status_code >= 400:
-        raise RuntimeError(f"OpenAI image error {resp.status_code}: {resp.text}")
-    data = resp.json().get("data", [])
-    if not data or "b64_json" not in data[0]:
+        stream=True,
+    ) as resp:
+        if resp.status_code >= 400:
+            raise RuntimeError(f"OpenAI image error {resp.status_code}: {resp.text}")
+        _, written = stream_image_response(resp.iter_content(UPLOAD_CHUNK_SIZE), img_path)
+    if not written:
         raise RuntimeError("Image response missing data")
-    image_dir.mkdir(parents=True, exist_ok=True)
-    timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
-    img_path = image_dir / f"poster_{timestamp}.png"
-    img_bytes = base64.b64decode(data[0]["b64_json"])
-    img_path.write_bytes(img_bytes)
-    return img_path
+    return ensure_image_format(img_path, output_format, output_compression)
@@ -0,0 +1,204 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable
+import base64
+import hashlib
+import json
+import os
+import re
+import uuid
+
+import requests
+
+from agents.artifact_store import blob_path
+from agents.media_cache import touch
+
+
+MASTER_SIZE = 1080
+MASTER_QUALITY = 90
+THUMBNAIL_SIZES = (160, 480)
+THUMBNAIL_QUALITY = 80
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+IMAGE_FORMATS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+PIL_FORMATS = {"png": "PNG", "jpeg": "JPEG", "webp": "WEBP"}
+
+
+def stream_to_disk(stream, dest_dir: Path, suffix: str, max_bytes: int) -> tuple[Path, str]:
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest_dir / f".upload.{os.urandom(4).hex()}{suffix}"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with tmp_path.open("wb") as f:
+            for chunk in iter(lambda: stream.read(UPLOAD_CHUNK_SIZE), b""):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise RuntimeError(
+                        f"파일이 너무 큽니다. 최대 {max_bytes // (1024 * 1024)}MB까지 올릴 수 있습니다."
+                    )
+                digest.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path, digest.hexdigest()
+
+
+def image_format_request(output_format: str, output_compression: int | None) -> dict:
+    if output_format not in IMAGE_FORMATS:
+        raise RuntimeError(f"지원하지 않는 이미지 형식입니다: {output_format}")
+    options = {"output_format": output_format}
+    if output_format != "png" and output_compression is not None:
+        options["output_compression"] = output_compression
+    return options
+
+
+B64_KEY_RE = re.compile(rb'"b64_json"\s*:\s*"')
+
+
+def stream_image_response(chunks: Iterable[bytes], path: Path) -> tuple[dict, bool]:
+    """Parse an images API response as it arrives.
+
+    The first "b64_json" string is decoded straight into path without ever
+    being held whole; everything else is collected and parsed as JSON with
+    that value left empty. Returns the parsed body and whether path was
+    written.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.part")
+    skeleton = bytearray()
+    pending = b""
+    state = "scan"
+    searched = 0
+    try:
+        with tmp_path.open("wb") as f:
+            for chunk in chunks:
+                if state != "value":
+                    skeleton += chunk
+                    if state == "done":
+                        continue
+                    match = B64_KEY_RE.search(skeleton, max(0, searched - 64))
+                    searched = len(skeleton)
+                    if not match:
+                        continue
+                    chunk = bytes(skeleton[match.end() :])
+                    del skeleton[match.end() :]
+                    state = "value"
+                end = chunk.find(b'"')
+                # JSON may escape "/" as "\/"; base64 has no other escapes.
+                pending += (chunk if end < 0 else chunk[:end]).replace(b"\\", b"")
+                usable = len(pending) - len(pending) % 4
+                f.write(base64.b64decode(pending[:usable]))
+                pending = pending[usable:]
+                if end >= 0:
+                    f.write(base64.b64decode(pending))
+                    skeleton += chunk[end:]
+                    state = "done"
+        if state == "value":
+            raise RuntimeError("Image response ended inside b64_json.")
+        body = json.loads(bytes(skeleton))
+        if state == "done":
+            os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return body, state == "done"
+
+
+def download_to(url: str, path: Path, timeout: int = 60) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.part")
+    try:
+        with requests.get(url, stream=True, timeout=timeout) as resp:
+            resp.raise_for_status()
+            with tmp_path.open("wb") as f:
+                for chunk in resp.iter_content(UPLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return path
+
+
+def ensure_image_format(path: Path, output_format: str, quality: int | None = None) -> Path:
+    # Endpoints that ignore output_format still return PNG; transcode
+    # locally so callers always get the configured format.
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(path) as image:
+            if image.format == PIL_FORMATS[output_format]:
+                return path
+            image = image.convert("RGBA" if output_format != "jpeg" else "RGB")
+    except (UnidentifiedImageError, OSError) as exc:
+        raise RuntimeError(f"이미지 파일을 읽을 수 없습니다: {path.name}") from exc
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.part")
+    options = {} if output_format == "png" else {"quality": quality or 85}
+    try:
+        image.save(tmp_path, PIL_FORMATS[output_format], **options)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return path
+
+
+def derivative_path(store_dir: Path, digest: str, name: str) -> Path:
+    # Derivatives sit next to the original and share its digest prefix, so
+    # the store's garbage collector keeps them exactly as long as it does.
+    return blob_path(store_dir, digest, f".{name}.jpg")
+
+
+def thumbnail_path(store_dir: Path, image_path: Path, size: int = THUMBNAIL_SIZES[-1]) -> Path:
+    return derivative_path(store_dir, image_path.name[:64], f"thumb{size}")
+
+
+def _save_jpeg(image, path: Path, quality: int) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.part")
+    try:
+        image.save(tmp_path, "JPEG", quality=quality, optimize=True, progressive=True)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def normalize_image(original: Path, store_dir: Path) -> dict:
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    digest = original.name[:64]
+    master = derivative_path(store_dir, digest, "master")
+    thumbnails = {size: derivative_path(store_dir, digest, f"thumb{size}") for size in THUMBNAIL_SIZES}
+    outputs = {
+        "original": str(original),
+        "master": str(master),
+        "thumbnails": {str(size): str(path) for size, path in thumbnails.items()},
+    }
+    if master.exists() and all(path.exists() for path in thumbnails.values()):
+        for path in (master, *thumbnails.values()):
+            touch(path)
+        return outputs
+    try:
+        with Image.open(original) as source:
+            # Let the JPEG decoder downscale by a power of two while decoding;
+            # the short side stays at least MASTER_SIZE.
+            source.draft("RGB", (MASTER_SIZE, MASTER_SIZE))
+            image = ImageOps.exif_transpose(source).convert("RGB")
+    except (UnidentifiedImageError, OSError) as exc:
+        raise RuntimeError(f"이미지 파일을 읽을 수 없습니다: {original.name}") from exc
+    scale = MASTER_SIZE / min(image.size)
+    if scale < 1:
+        size = (round(image.width * scale), round(image.height * scale))
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    _save_jpeg(image, master, MASTER_QUALITY)
+    for size, path in sorted(thumbnails.items(), reverse=True):
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        _save_jpeg(image, path, THUMBNAIL_QUALITY)
+    return outputs
+
+
+def normalize_images(originals: list[Path], store_dir: Path, max_workers: int | None = None) -> list[dict]:
+    if not originals:
+        return []
+    # Pillow releases the GIL while decoding and resampling, so a thread
+    # pool is enough to spread several uploads over the cores.
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(originals)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda path: normalize_image(path, store_dir), originals))
@@ -0,0 +1,62 @@
+from pathlib import Path
+import hashlib
+import os
+import time
+
+
+def content_key(*parts: object) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def file_digest(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def touch(path: Path) -> None:
+    try:
+        now = time.time()
+        os.utime(path, (now, now))
+    except OSError:
+        pass
+
+
+def prune_cache(
+    cache_dir: Path,
+    max_bytes: int | None = None,
+    max_entries: int | None = None,
+) -> list[Path]:
+    if not cache_dir.exists():
+        return []
+    # Entries are grouped by file stem so a clip and its sidecar JSON are
+    # evicted together; the most recently used group is kept first.
+    groups: dict[str, list[Path]] = {}
+    for path in cache_dir.iterdir():
+        if path.is_file():
+            groups.setdefault(path.stem, []).append(path)
+    entries = []
+    for stem, paths in groups.items():
+        stats = [p.stat() for p in paths]
+        entries.append(
+            (max(s.st_mtime for s in stats), sum(s.st_size for s in stats), paths)
+        )
+    entries.sort(key=lambda item: item[0], reverse=True)
+    removed: list[Path] = []
+    kept_bytes = 0
+    for idx, (_, size, paths) in enumerate(entries):
+        over_count = max_entries is not None and idx >= max_entries
+        over_bytes = max_bytes is not None and kept_bytes + size > max_bytes
+        if over_count or over_bytes:
+            for path in paths:
+                path.unlink(missing_ok=True)
+                removed.append(path)
+            continue
+        kept_bytes += size
+    return removed
@@ -0,0 +1,233 @@
+from pathlib import Path
+import datetime as dt
+import json
+import queue
+import re
+import threading
+import time
+import uuid
+
+from agents.profile_clones import clone_dirs
+
+
+DEFAULT_RETRIES = 2
+RETRY_DELAY_SECONDS = 3.0
+HISTORY_LIMIT = 50
+DEFAULT_MAX_BROWSERS = 2
+
+# Jobs are kept in memory with their full upload arguments; only the public
+# fields are written to the state file that the status endpoint reads.
+_JOBS: dict[str, dict] = {}
+_POSTS: dict[str, dict] = {}
+_QUEUES: dict[str, queue.Queue] = {}
+_WORKERS: dict[str, list[threading.Thread]] = {}
+_LOCK = threading.Lock()
+# Caps how many posts are being typed at once across every profile.
+_BROWSER_SLOTS = threading.BoundedSemaphore(DEFAULT_MAX_BROWSERS)
+_LOADED_FROM: set[Path] = set()
+_STOPPING = threading.Event()
+_RUNNING = {"count": 0}
+
+
+def _now() -> str:
+    return dt.datetime.now().isoformat(timespec="seconds")
+
+
+def _save_state(state_path: Path) -> None:
+    with _LOCK:
+        jobs = sorted(_JOBS.values(), key=lambda job: job["created_at"])[-HISTORY_LIMIT:]
+        payload = json.dumps({"jobs": jobs}, ensure_ascii=False, indent=2)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp_path.write_text(payload, encoding="utf-8")
+    tmp_path.replace(state_path)
+
+
+def _load_state(state_path: Path) -> None:
+    # Jobs from an earlier run cannot be resumed (their upload arguments
+    # were never saved), so unfinished ones are shown as failed.
+    with _LOCK:
+        if state_path in _LOADED_FROM:
+            return
+        _LOADED_FROM.add(state_path)
+        try:
+            jobs = json.loads(state_path.read_text(encoding="utf-8")).get("jobs", [])
+        except (OSError, ValueError):
+            jobs = []
+        for job in jobs:
+            if job.get("id") in _JOBS:
+                continue
+            if job.get("status") not in ("done", "failed"):
+                job.update(status="failed", error="앱이 다시 시작되어 중단되었습니다.")
+            _JOBS[job["id"]] = job
+
+
+def set_browser_limit(limit: int) -> None:
+    global _BROWSER_SLOTS
+    _BROWSER_SLOTS = threading.BoundedSemaphore(max(1, limit))
+
+
+def list_jobs(state_path: Path) -> list[dict]:
+    _load_state(state_path)
+    with _LOCK:
+        jobs = sorted(_JOBS.values(), key=lambda job: job["created_at"], reverse=True)
+        return json.loads(json.dumps(jobs[:HISTORY_LIMIT]))
+
+
+def enqueue_post(
+    post: dict, state_path: Path, retries: int = DEFAULT_RETRIES, workers: int = 1
+) -> str:
+    """Queue one open_naver_writer call; returns the job id.
+
+    With one worker, posts for a browser profile run one after another in
+    that profile. With more, each worker gets its own clone of the profile
+    (login files only) so several posts are typed at the same time.
+    """
+    _load_state(state_path)
+    job_id = uuid.uuid4().hex[:12]
+    profile_dir = post["profile_dir"]
+    job = {
+        "id": job_id,
+        "title": post.get("title", ""),
+        "draft_id": post.pop("draft_id", None),
+        "profile_dir": profile_dir,
+        "worker_profile": "",
+        "status": "waiting",
+        "step": "",
+        "attempts": 0,
+        "retries": retries,
+        "progress": {},
+        "paragraph_count": 0,
+        "timings": {},
+        "error": "",
+        "created_at": _now(),
+        "finished_at": "",
+    }
+    with _LOCK:
+        _JOBS[job_id] = job
+        _POSTS[job_id] = post
+        work = _QUEUES.setdefault(profile_dir, queue.Queue())
+        work.put(job_id)
+        workers = max(1, workers)
+        worker_profiles = [profile_dir] if workers == 1 else clone_dirs(profile_dir, workers)
+        threads = _WORKERS.setdefault(profile_dir, [])
+        threads[:] = [thread for thread in threads if thread.is_alive()]
+        busy = {thread.name for thread in threads}
+        for worker_profile in worker_profiles:
+            if worker_profile in busy:
+                continue
+            thread = threading.Thread(
+                target=_worker,
+                args=(profile_dir, worker_profile, work, state_path),
+                name=worker_profile,
+                daemon=True,
+            )
+            threads.append(thread)
+            thread.start()
+    _save_state(state_path)
+    return job_id
+
+
+def _cancel_waiting(state_path: Path) -> None:
+    with _LOCK:
+        for job in _JOBS.values():
+            if job["status"] == "waiting":
+                job.update(status="failed", error="서버가 종료되어 취소되었습니다.", finished_at=_now())
+    _save_state(state_path)
+
+
+def drain_queue(state_path: Path, timeout: float) -> None:
+    """Let the posts being typed finish and cancel the ones still waiting."""
+    _STOPPING.set()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with _LOCK:
+            if not _RUNNING["count"]:
+                break
+        time.sleep(0.2)
+    _cancel_waiting(state_path)
+
+
+def _worker(profile_dir: str, worker_profile: str, work: queue.Queue, state_path: Path) -> None:
+    template_dir = "" if worker_profile == profile_dir else profile_dir
+    while True:
+        job_id = work.get()
+        if _STOPPING.is_set():
+            _cancel_waiting(state_path)
+            work.task_done()
+            continue
+        with _LOCK:
+            _RUNNING["count"] += 1
+        try:
+            post = {**_POSTS.pop(job_id), "profile_dir": worker_profile, "template_dir": template_dir}
+            _update(_JOBS[job_id], state_path, worker_profile=worker_profile)
+            _run_job(_JOBS[job_id], post, state_path)
+        finally:
+            with _LOCK:
+                _RUNNING["count"] -= 1
+            work.task_done()
+
+
+def _update(job: dict, state_path: Path, **fields) -> None:
+    with _LOCK:
+        job.update(fields)
+    _save_state(state_path)
+
+
+def _run_job(job: dict, post: dict, state_path: Path) -> None:
+    # Imported here so listing or queueing jobs does not load Selenium.
+    from agents.naver_uploader import open_naver_writer
+
+    body = (post.get("body") or "").replace("\r\n", "\n").strip()
+    paragraph_count = len([p for p in re.split(r"\n\s*\n", body) if p.strip()])
+    _update(job, state_path, paragraph_count=paragraph_count)
+    # The uploader fills this in as it goes; a retry hands it back so the
+    # post continues after the last finished paragraph.
+    progress: dict = {}
+    clock = {"step": "", "started": time.perf_counter()}
+
+    def close_step() -> dict:
+        # Per-step wall time, summed over attempts.
+        timings = dict(job["timings"])
+        if clock["step"]:
+            elapsed = time.perf_counter() - clock["started"]
+            timings[clock["step"]] = round(timings.get(clock["step"], 0.0) + elapsed, 2)
+        clock["step"] = ""
+        return timings
+
+    def on_step(name: str) -> None:
+        if name != clock["step"]:
+            timings = close_step()
+            clock.update(step=name, started=time.perf_counter())
+        else:
+            timings = job["timings"]
+        status = "uploading_images" if name == "uploading_images" else "typing"
+        _update(job, state_path, step=name, status=status, timings=timings, progress=dict(progress))
+
+    for attempt in range(job["retries"] + 1):
+        _update(job, state_path, attempts=attempt + 1, error="")
+        try:
+            with _BROWSER_SLOTS:
+                open_naver_writer(**post, progress=progress, on_step=on_step)
+        except Exception as exc:
+            fields = {
+                "timings": close_step(),
+                "progress": dict(progress),
+                "error": str(exc) or exc.__class__.__name__,
+            }
+            if attempt < job["retries"] and not _STOPPING.is_set():
+                _update(job, state_path, status="waiting", **fields)
+                time.sleep(RETRY_DELAY_SECONDS * (attempt + 1))
+                continue
+            _update(job, state_path, status="failed", step="", finished_at=_now(), **fields)
+        else:
+            _update(
+                job,
+                state_path,
+                status="done",
+                step="",
+                timings=close_step(),
+                progress=dict(progress),
+                finished_at=_now(),
+            )
+        break
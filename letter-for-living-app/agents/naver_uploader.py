@@ -2,15 +2,16 @@ import random
 import re
 import time
 from pathlib import Path
-import shutil
+from typing import Callable
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from agents.browser_pool import DEFAULT_MAX_USES, clear_tab, lease_driver
+
 
 def open_naver_writer(
     write_url: str,
@@ -21,49 +22,209 @@ def open_naver_writer(
     profile_dir: str,
     project_root: Path,
     image_paths: list[str] | None = None,
+    max_uses: int = DEFAULT_MAX_USES,
+    typing_mode: str = "paste",
+    headless: bool = False,
+    progress: dict | None = None,
+    on_step: Callable[[str], None] | None = None,
+    template_dir: str = "",
 ) -> None:
-    driver_path = shutil.which("chromedriver")
-    if not driver_path:
-        raise RuntimeError("chromedriver를 찾을 수 없습니다. 설치 후 다시 시도해 주세요.")
-
-    options = webdriver.ChromeOptions()
-    options.add_experimental_option("detach", True)
-    chrome_candidates = [
-        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-        "/Applications/Google Chrome for Testing.app/Contents/MacOS/Google Chrome for Testing",
-        "/Applications/Chromium.app/Contents/MacOS/Chromium",
-    ]
-    chrome_bin = next((p for p in chrome_candidates if Path(p).exists()), "")
-    if chrome_bin:
-        options.binary_location = chrome_bin
-    else:
-        raise RuntimeError("Chrome 브라우저를 찾을 수 없습니다. Chrome 설치 후 다시 시도해 주세요.")
+    # A retry with saved progress stays in the tab of the half-written post
+    # so fill_naver_editor can carry on from where it stopped.
+    with lease_driver(
+        profile_dir,
+        project_root,
+        max_uses=max_uses,
+        headless=headless,
+        reset=not progress,
+        template_dir=template_dir,
+    ) as driver:
+        fill_naver_editor(
+            driver, write_url, title, body, image_paths, typing_mode, progress, on_step
+        )
 
-    if profile_dir:
-        Path(profile_dir).mkdir(parents=True, exist_ok=True)
-        lock_path = Path(profile_dir) / "SingletonLock"
-        if lock_path.exists():
-            raise RuntimeError(
-                "Chrome 프로필이 다른 창에서 사용 중입니다. "
-                "모든 Chrome 창을 닫고 다시 시도해 주세요."
-            )
-        options.add_argument(f"--user-data-dir={profile_dir}")
-        options.add_argument("--no-first-run")
-        options.add_argument("--no-default-browser-check")
 
-    log_path = project_root / "logs" / "chromedriver.log"
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    service = Service(driver_path, log_output=str(log_path))
-    driver = webdriver.Chrome(service=service, options=options)
-    driver.get(write_url)
+# Returns 'ok' once the editor has grown by exactly the pasted text, 'none'
+# when nothing was inserted (typing can take over), and 'partial' otherwise.
+PASTE_SCRIPT = """
+const text = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const target = document.activeElement || document.body;
+const root = 'value' in target ? target : (target.closest('[contenteditable="true"]') || document.body);
+const size = (value) => (value || '').replace(/\\s+/g, '').length;
+// Placeholders vanish on the first input, so they are not counted.
+const measure = () => {
+  if ('value' in root) return size(root.value);
+  let total = size(root.textContent);
+  root.querySelectorAll('.se-placeholder').forEach(el => { total -= size(el.textContent); });
+  return total;
+};
+const expected = size(text);
+const before = measure();
+const data = new DataTransfer();
+data.setData('text/plain', text);
+const event = new ClipboardEvent('paste', {clipboardData: data, bubbles: true, cancelable: true});
+// SmartEditor cancels the event and inserts the text itself, possibly a
+// tick later; insertText is only used when nobody handled the paste, so
+// the text never lands twice.
+if (target.dispatchEvent(event) && measure() === before) {
+  document.execCommand('insertText', false, text);
+}
+const started = Date.now();
+const check = () => {
+  const added = measure() - before;
+  if (added === expected) { done('ok'); return; }
+  if (Date.now() - started >= timeoutMs) { done(added === 0 ? 'none' : 'partial'); return; }
+  setTimeout(check, 50);
+};
+check();
+"""
+
+
+# Image blocks SmartEditor inserts once an upload has been accepted, and the
+# progress overlays it shows while the file is still being sent.
+IMAGE_COMPONENT_SELECTOR = "div.se-component.se-image"
+UPLOAD_BUSY_SELECTOR = "div.se-image-loading, div.se-loading, div.se-popup-progress"
+UPLOAD_TIMEOUT = 60
+PASTE_TIMEOUT = 2
+
+# What a half-written post already contains, to decide whether a retry can
+# continue in place.
+TYPED_STATE_SCRIPT = """
+const outsideTitle = (el) => !el.closest('.se-documentTitle, .se-title-text');
+const title = document.querySelector('.se-documentTitle p.se-text-paragraph, .se-title-text p.se-text-paragraph');
+const paragraphs = Array.from(document.querySelectorAll('p.se-text-paragraph'))
+  .filter(p => outsideTitle(p) && !p.querySelector('.se-placeholder'))
+  .map(p => p.textContent || '')
+  .filter(text => text.trim());
+return {
+  title: title && !title.querySelector('.se-placeholder') ? title.textContent : '',
+  paragraphs: paragraphs,
+  images: document.querySelectorAll(arguments[0]).length,
+};
+"""
+
+# Caret at the end of the last typed paragraph. Images still waiting for
+# their text sit below it, followed by the editor's empty trailing line.
+FOCUS_END_SCRIPT = """
+const paragraphs = Array.from(document.querySelectorAll('p.se-text-paragraph'))
+  .filter(p => !p.closest('.se-documentTitle, .se-title-text'))
+  .filter(p => !p.querySelector('.se-placeholder') && (p.textContent || '').trim());
+const last = paragraphs[paragraphs.length - 1];
+if (!last) return null;
+const host = last.closest('[contenteditable="true"]');
+if (host) host.focus();
+const range = document.createRange();
+range.selectNodeContents(last);
+range.collapse(false);
+const selection = window.getSelection();
+selection.removeAllRanges();
+selection.addRange(range);
+return last;
+"""
 
-    wait = WebDriverWait(driver, 15)
+# Where the text after the n-th image goes: an empty text line the editor
+# already left right below it (the caret is put there), or else the image
+# itself, which is then selected and given a new line with Enter.
+LINE_AFTER_IMAGE_SCRIPT = """
+const image = document.querySelectorAll(arguments[0])[arguments[1]];
+if (!image) return null;
+const next = image.nextElementSibling;
+const lines = next && next.matches('.se-component.se-text')
+  ? Array.from(next.querySelectorAll('p.se-text-paragraph')) : [];
+if (!lines.length || lines.some(p => (p.textContent || '').trim())) return {image: image};
+const host = lines[0].closest('[contenteditable="true"]');
+if (host) host.focus();
+const range = document.createRange();
+range.selectNodeContents(lines[0]);
+range.collapse(true);
+const selection = window.getSelection();
+selection.removeAllRanges();
+selection.addRange(range);
+return {line: lines[0]};
+"""
 
-    if "nid.naver.com" in driver.current_url:
-        WebDriverWait(driver, 180).until(lambda d: "nid.naver.com" not in d.current_url)
+WAIT_SCRIPT = """
+const kind = arguments[0];
+const value = arguments[1];
+const timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const check = () => {
+  if (kind === 'selector') {
+    for (const selector of value) {
+      const el = document.querySelector(selector);
+      if (el) return el;
+    }
+    return null;
+  }
+  // 'upload': enough image components, no progress overlay, images decoded.
+  const items = document.querySelectorAll(value.selector);
+  if (items.length < value.count) return null;
+  if (value.busy && document.querySelector(value.busy)) return null;
+  const images = Array.from(items).flatMap(item => Array.from(item.querySelectorAll('img')));
+  return images.every(img => img.complete) ? items.length : null;
+};
+const first = check();
+if (first) { done(first); return; }
+let timer = null;
+const finish = (result) => {
+  observer.disconnect();
+  document.removeEventListener('load', onChange, true);
+  clearTimeout(timer);
+  done(result);
+};
+const onChange = () => { const found = check(); if (found) finish(found); };
+const observer = new MutationObserver(onChange);
+observer.observe(document, {childList: true, subtree: true, attributes: true});
+// Image load events do not mutate the DOM, so listen for them as well.
+document.addEventListener('load', onChange, true);
+timer = setTimeout(() => finish(check()), timeoutMs);
+"""
 
-    driver.get(write_url)
-    wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+
+def compute_image_positions(paragraph_count: int, image_count: int) -> list[int]:
+    # Index of the paragraph each image goes in front of.
+    if paragraph_count <= 0 or image_count <= 0:
+        return []
+    base_positions = [0, 2, 3, 4]
+    positions: list[int] = []
+    for idx in range(min(image_count, len(base_positions))):
+        pos = base_positions[idx]
+        if pos >= paragraph_count:
+            pos = paragraph_count - 1
+        while positions and pos <= positions[-1] and pos < paragraph_count - 1:
+            pos += 1
+        positions.append(pos)
+    return positions
+
+
+def fill_naver_editor(
+    driver,
+    write_url: str,
+    title: str,
+    body: str,
+    image_paths: list[str] | None = None,
+    typing_mode: str = "paste",
+    progress: dict | None = None,
+    on_step: Callable[[str], None] | None = None,
+) -> None:
+    # progress records what is already in the editor ("title", and how many
+    # "paragraphs" and "images") and is updated in place as each part is
+    # finished.
+    progress = progress if progress is not None else {}
+    step = on_step or (lambda name: None)
+
+    def load_writer() -> None:
+        driver.get(write_url)
+        if "nid.naver.com" in driver.current_url:
+            WebDriverWait(driver, 180).until(lambda d: "nid.naver.com" not in d.current_url)
+            driver.get(write_url)
+        WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+
+    # The editor lives in one iframe; once found it is tried first so
+    # later lookups do not re-scan every frame on the page.
+    editor_frame = {"frame": None}
 
     def find_first(selectors: list[str]):
         for selector in selectors:
@@ -72,55 +233,102 @@ def open_naver_writer(
                 return elements[0]
         return None
 
-    def locate_in_frames(selectors: list[str], timeout: int = 40):
-        end = time.time() + timeout
-        while time.time() < end:
-            frames = [None]
-            try:
-                frames.extend(driver.find_elements(By.TAG_NAME, "iframe"))
-            except Exception:
-                pass
-            for frame in frames:
-                try:
-                    if frame is None:
-                        driver.switch_to.default_content()
-                    else:
-                        driver.switch_to.frame(frame)
-                except Exception:
-                    continue
-                el = find_first(selectors)
-                if el:
-                    return el
-            time.sleep(0.5)
+    def enter_frame(frame) -> bool:
+        try:
+            driver.switch_to.default_content()
+            if frame is not None:
+                driver.switch_to.frame(frame)
+            return True
+        except Exception:
+            return False
+
+    def frame_candidates() -> list:
+        cached = editor_frame["frame"]
+        frames = [None] if cached is None else [cached, None]
+        try:
+            driver.switch_to.default_content()
+            frames.extend(
+                frame for frame in driver.find_elements(By.TAG_NAME, "iframe") if frame != cached
+            )
+        except Exception:
+            pass
+        return frames
+
+    def scan_frames(selectors: list[str]):
+        for frame in frame_candidates():
+            if not enter_frame(frame):
+                if frame is not None and frame == editor_frame["frame"]:
+                    editor_frame["frame"] = None
+                continue
+            el = find_first(selectors)
+            if el:
+                if frame is not None:
+                    editor_frame["frame"] = frame
+                return el
         return None
 
+    def wait_in_frame(kind: str, value, timeout: float):
+        # Resolves inside the page on the first DOM mutation that satisfies
+        # the condition instead of re-checking on a fixed interval.
+        try:
+            driver.set_script_timeout(timeout + 5)
+            return driver.execute_async_script(WAIT_SCRIPT, kind, value, int(timeout * 1000))
+        except Exception:
+            return None
+
+    def locate_in_frames(selectors: list[str], timeout: int = 40):
+        cached = editor_frame["frame"]
+        if cached is not None and enter_frame(cached):
+            el = wait_in_frame("selector", selectors, timeout)
+            if el:
+                return el
+            return scan_frames(selectors)
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=0.25).until(
+                lambda d: scan_frames(selectors)
+            )
+        except Exception:
+            return None
+
     def click_in_frames(selectors: list[str], timeout: int = 20) -> bool:
-        end = time.time() + timeout
-        while time.time() < end:
-            frames = [None]
+        el = locate_in_frames(selectors, timeout=timeout)
+        if el is None:
+            return False
+        try:
+            el.click()
+        except Exception:
             try:
-                frames.extend(driver.find_elements(By.TAG_NAME, "iframe"))
+                driver.execute_script("arguments[0].click();", el)
             except Exception:
-                pass
-            for frame in frames:
-                try:
-                    if frame is None:
-                        driver.switch_to.default_content()
-                    else:
-                        driver.switch_to.frame(frame)
-                except Exception:
-                    continue
-                for selector in selectors:
-                    try:
-                        el = driver.find_element(By.CSS_SELECTOR, selector)
-                        el.click()
-                        return True
-                    except Exception:
-                        continue
-            time.sleep(0.5)
-        return False
+                return False
+        return True
+
+    def count_image_components() -> int:
+        try:
+            return int(
+                driver.execute_script(
+                    "return document.querySelectorAll(arguments[0]).length;",
+                    IMAGE_COMPONENT_SELECTOR,
+                )
+            )
+        except Exception:
+            return 0
+
+    def wait_for_upload(expected: int, timeout: int = UPLOAD_TIMEOUT) -> bool:
+        if editor_frame["frame"] is not None:
+            enter_frame(editor_frame["frame"])
+        state = {
+            "selector": IMAGE_COMPONENT_SELECTOR,
+            "count": expected,
+            "busy": UPLOAD_BUSY_SELECTOR,
+        }
+        return bool(wait_in_frame("upload", state, timeout))
 
-    def insert_image(path: str) -> None:
+    def upload_images(paths: list[str]) -> int:
+        # One submission on the multi-file input uploads every image
+        # together; the editor appends them at the cursor in this order.
+        if not paths:
+            return 0
         image_button_selectors = [
             "button.se-image-toolbar-button",
             "button[data-name='image']",
@@ -129,8 +337,8 @@ def open_naver_writer(
             "button[title*='이미지']",
             "button[aria-label*='이미지']",
         ]
+        before = count_image_components()
         click_in_frames(image_button_selectors, timeout=10)
-        time.sleep(0.6)
         file_input = locate_in_frames(
             [
                 "input#hidden-file",
@@ -139,10 +347,17 @@ def open_naver_writer(
             ],
             timeout=20,
         )
-        if file_input:
+        if not file_input:
+            return 0
+        try:
+            batches = [paths] if file_input.get_attribute("multiple") else [[path] for path in paths]
+        except Exception:
+            batches = [[path] for path in paths]
+        expected = before
+        for batch in batches:
+            expected += len(batch)
             try:
-                file_input.send_keys(path)
-                time.sleep(2.5)
+                file_input.send_keys("\n".join(batch))
             except Exception:
                 try:
                     driver.execute_script(
@@ -150,24 +365,43 @@ def open_naver_writer(
                         "const el = inputs[inputs.length - 1];"
                         "if(el){el.value='';}",
                     )
-                    file_input.send_keys(path)
-                    time.sleep(2.5)
+                    file_input.send_keys("\n".join(batch))
                 except Exception:
-                    pass
+                    break
+            wait_for_upload(expected, timeout=UPLOAD_TIMEOUT * len(batch))
+        return max(0, count_image_components() - before)
 
-    def compute_image_positions(paragraph_count: int, image_count: int) -> list[int]:
-        if paragraph_count <= 0 or image_count <= 0:
-            return []
-        base_positions = [0, 2, 3, 4]
-        positions: list[int] = []
-        for idx in range(min(image_count, len(base_positions))):
-            pos = base_positions[idx]
-            if pos >= paragraph_count:
-                pos = paragraph_count - 1
-            while positions and pos <= positions[-1] and pos < paragraph_count - 1:
-                pos += 1
-            positions.append(pos)
-        return positions
+    def insert_images() -> None:
+        # Every image goes up in one submission at the top of the empty
+        # body, in paragraph order; the text is typed in between afterwards.
+        step("uploading_images")
+        uploaded = upload_images([image_map[pos] for pos in image_order])
+        if uploaded < len(image_order):
+            raise RuntimeError(
+                f"이미지 업로드가 끝나지 않았습니다 ({uploaded}/{len(image_order)})."
+            )
+        progress["images"] = uploaded
+        step("typing")
+
+    def open_line_after_image(pos: int) -> None:
+        # The editor's own way of writing below an image: select it and
+        # press Enter. No component is moved by script, so its model stays
+        # in step with the page.
+        index = image_order.index(pos)
+        if editor_frame["frame"] is not None:
+            enter_frame(editor_frame["frame"])
+        try:
+            target = driver.execute_script(LINE_AFTER_IMAGE_SCRIPT, IMAGE_COMPONENT_SELECTOR, index)
+        except Exception:
+            target = None
+        if not target:
+            raise RuntimeError(f"{index + 1}번째 이미지를 찾지 못했습니다.")
+        if target.get("line") is not None:
+            return
+        try:
+            ActionChains(driver).click(target["image"]).pause(0.2).send_keys(Keys.ENTER).perform()
+        except Exception as exc:
+            raise RuntimeError(f"{index + 1}번째 이미지 아래에 문단을 열지 못했습니다.") from exc
 
     def click_align_button(mode: str) -> None:
         if mode == "center":
@@ -185,18 +419,8 @@ def open_naver_writer(
         click_in_frames(selectors, timeout=4)
 
     def set_by_placeholder(match_text: str, mode: str, text_value: str) -> bool:
-        frames = [None]
-        try:
-            frames.extend(driver.find_elements(By.TAG_NAME, "iframe"))
-        except Exception:
-            pass
-        for frame in frames:
-            try:
-                if frame is None:
-                    driver.switch_to.default_content()
-                else:
-                    driver.switch_to.frame(frame)
-            except Exception:
+        for frame in frame_candidates():
+            if not enter_frame(frame):
                 continue
             try:
                 found = driver.execute_script(
@@ -228,11 +452,26 @@ def open_naver_writer(
                 continue
         return False
 
-    def set_element_text(el, text: str) -> bool:
+    def paste_text(text: str) -> bool:
         try:
-            el.click()
+            driver.set_script_timeout(PASTE_TIMEOUT + 5)
+            result = driver.execute_async_script(PASTE_SCRIPT, text, int(PASTE_TIMEOUT * 1000))
         except Exception:
-            pass
+            return False
+        if result == "partial":
+            # Typing on top would duplicate what did arrive; fail the attempt
+            # so a retry starts the post over.
+            raise RuntimeError("붙여넣은 내용이 입력한 글과 다릅니다.")
+        return result == "ok"
+
+    def set_element_text(el, text: str, click: bool = True) -> bool:
+        if click:
+            try:
+                el.click()
+            except Exception:
+                pass
+        if typing_mode == "paste" and paste_text(text):
+            return True
         try:
             def human_type(target, value: str) -> None:
                 for ch in value:
@@ -256,6 +495,51 @@ def open_naver_writer(
         except Exception:
             return False
 
+    def new_paragraph(el) -> None:
+        # The placeholder the body was located by is gone once typing starts,
+        # so keys go to whatever the editor has focused.
+        try:
+            driver.switch_to.active_element.send_keys("\n\n")
+        except Exception:
+            try:
+                el.send_keys("\n\n")
+            except Exception:
+                pass
+
+    def compact(text: str) -> str:
+        return "".join((text or "").split())
+
+    def can_resume(paragraphs: list[str]) -> bool:
+        # Only continue in place when the editor still shows exactly what
+        # progress says was typed, with all images uploaded before any body
+        # text; anything else starts the post over.
+        if not progress.get("title"):
+            return False
+        typed_count = progress.get("paragraphs", 0)
+        expected_images = progress.get("images", 0)
+        if expected_images not in (0, len(image_order)):
+            return False
+        if typed_count and expected_images != len(image_order):
+            return False
+        if locate_in_frames(["p.se-text-paragraph"], timeout=5) is None:
+            return False
+        try:
+            state = driver.execute_script(TYPED_STATE_SCRIPT, IMAGE_COMPONENT_SELECTOR)
+        except Exception:
+            return False
+        if not state or state.get("images") != expected_images:
+            return False
+        typed = paragraphs[:typed_count]
+        return compact(state.get("title", "")) == compact(title) and compact(
+            "".join(state.get("paragraphs") or [])
+        ) == compact("".join(typed))
+
+    def focus_body_end():
+        try:
+            return driver.execute_script(FOCUS_END_SCRIPT)
+        except Exception:
+            return None
+
     def is_title_element(el) -> bool:
         try:
             return bool(
@@ -267,92 +551,114 @@ def open_naver_writer(
         except Exception:
             return False
 
-    title_el = None
-    try:
-        driver.switch_to.default_content()
-    except Exception:
-        pass
-    placeholder_el = locate_in_frames(["span.se-placeholder"], timeout=10)
-    if placeholder_el:
+    normalized = body.replace("\r\n", "\n").strip()
+    paragraphs = [p for p in re.split(r"\n\s*\n", normalized) if p.strip()]
+    cleaned_image_paths = [path for path in (image_paths or []) if path and Path(path).exists()]
+    image_positions = compute_image_positions(len(paragraphs), len(cleaned_image_paths))
+    image_map = {pos: cleaned_image_paths[idx] for idx, pos in enumerate(image_positions)}
+    image_order = sorted(image_map)
+    step("open")
+    resuming = bool(progress) and can_resume(paragraphs)
+    if not resuming:
+        if progress:
+            # The lease kept this post's tab for us; start it over in place so
+            # the other posts left open for review are untouched.
+            clear_tab(driver)
+            progress.clear()
+        load_writer()
+    progress.setdefault("paragraphs", 0)
+
+    step("title")
+    if not progress.get("title"):
+        title_el = None
         try:
-            text = (placeholder_el.text or "").strip()
-            if text == "제목":
-                title_el = placeholder_el
+            driver.switch_to.default_content()
         except Exception:
-            title_el = None
-    if not title_el:
-        title_selectors = [
-            "textarea.se-title-input",
-            "input#title",
-            "input.se-title-input",
-            "div.se-title-text",
-        ]
-        title_el = locate_in_frames(title_selectors, timeout=20)
-    if title_el:
-        set_element_text(title_el, title)
+            pass
+        placeholder_el = locate_in_frames(["span.se-placeholder"], timeout=10)
+        if placeholder_el:
+            try:
+                text = (placeholder_el.text or "").strip()
+                if text == "제목":
+                    title_el = placeholder_el
+            except Exception:
+                title_el = None
+        if not title_el:
+            title_selectors = [
+                "textarea.se-title-input",
+                "input#title",
+                "input.se-title-input",
+                "div.se-title-text",
+            ]
+            title_el = locate_in_frames(title_selectors, timeout=20)
+        if title_el:
+            typed_title = set_element_text(title_el, title)
+        else:
+            typed_title = set_by_placeholder("제목", "exact", title)
+        if not typed_title:
+            raise RuntimeError("제목 입력란을 찾지 못했습니다.")
+        progress["title"] = True
+
+    step("typing")
+    if progress["paragraphs"]:
+        body_el = focus_body_end()
     else:
-        set_by_placeholder("제목", "exact", title)
-
-    body_selectors = [
-        "p.se-text-paragraph .se-placeholder",
-        "p.se-text-paragraph.se-placeholder-focused",
-        "p.se-text-paragraph",
-        "div.se-component-content",
-        "div.se-text-paragraph",
-        "div[contenteditable='true']",
-        "textarea#content",
-        "textarea[name='content']",
-    ]
-    body_el = locate_in_frames(body_selectors, timeout=60)
-    if body_el and is_title_element(body_el):
-        body_el = None
-    if body_el:
-        time.sleep(0.6)
-        normalized = body.replace("\r\n", "\n").strip()
-        paragraphs = [p for p in re.split(r"\n\s*\n", normalized) if p.strip()]
-        cleaned_image_paths = [
-            path for path in (image_paths or []) if path and Path(path).exists()
+        body_selectors = [
+            "p.se-text-paragraph .se-placeholder",
+            "p.se-text-paragraph.se-placeholder-focused",
+            "p.se-text-paragraph",
+            "div.se-component-content",
+            "div.se-text-paragraph",
+            "div[contenteditable='true']",
+            "textarea#content",
+            "textarea[name='content']",
         ]
-        image_positions = compute_image_positions(
-            len(paragraphs), len(cleaned_image_paths)
-        )
-        image_map = {
-            pos: cleaned_image_paths[idx]
-            for idx, pos in enumerate(image_positions)
-        }
+        body_el = locate_in_frames(body_selectors, timeout=60)
+        if body_el and is_title_element(body_el):
+            body_el = None
+    if body_el:
+        try:
+            WebDriverWait(driver, 5).until(EC.element_to_be_clickable(body_el))
+        except Exception:
+            pass
         if paragraphs:
-            try:
-                body_el.click()
-            except Exception:
-                pass
-            click_align_button("center")
-            if 0 in image_map:
-                insert_image(image_map[0])
-            set_element_text(body_el, paragraphs[0])
-            try:
-                body_el.send_keys("\n\n")
-            except Exception:
-                pass
-            click_align_button("left")
-            for idx, para in enumerate(paragraphs[1:], start=1):
+            if not progress["paragraphs"]:
                 try:
-                    body_el.send_keys("\n\n")
+                    body_el.click()
                 except Exception:
                     pass
+                if image_map:
+                    if not progress.get("images"):
+                        insert_images()
+                    open_line_after_image(0)
+                click_align_button("center")
+                if not set_element_text(body_el, paragraphs[0], click=not image_map):
+                    raise RuntimeError("본문 1번째 문단 입력에 실패했습니다.")
+                new_paragraph(body_el)
+                click_align_button("left")
+                progress["paragraphs"] = 1
+                step("typing")
+            for idx in range(progress["paragraphs"], len(paragraphs)):
                 if idx in image_map:
-                    insert_image(image_map[idx])
-                set_element_text(body_el, para)
+                    open_line_after_image(idx)
+                else:
+                    new_paragraph(body_el)
+                if not set_element_text(body_el, paragraphs[idx], click=False):
+                    raise RuntimeError(f"본문 {idx + 1}번째 문단 입력에 실패했습니다.")
+                progress["paragraphs"] = idx + 1
+                step("typing")
         else:
             if not set_element_text(body_el, body):
                 if not set_by_placeholder("일상을", "contains", body):
                     set_by_placeholder("글감과 함께", "contains", body)
     else:
         if not set_by_placeholder("일상을", "contains", body):
-            set_by_placeholder("글감과 함께", "contains", body)
+            if not set_by_placeholder("글감과 함께", "contains", body):
+                raise RuntimeError("본문 입력란을 찾지 못했습니다.")
 
     if image_paths and not body:
         cleaned_image_paths = [
             path for path in image_paths if path and Path(path).exists()
         ]
         if cleaned_image_paths:
-            insert_image(cleaned_image_paths[0])
+            upload_images(cleaned_image_paths[:1])
@@ -0,0 +1,93 @@
+from pathlib import Path
+import os
+import shutil
+import subprocess
+import sys
+
+
+# Only what keeps the Naver login alive is copied into a working profile;
+# the cache, history and extension data of the template stay behind.
+SESSION_FILES = (
+    "Local State",
+    "Default/Cookies",
+    "Default/Cookies-journal",
+    "Default/Network/Cookies",
+    "Default/Network/Cookies-journal",
+    "Default/Login Data",
+    "Default/Login Data-journal",
+    "Default/Preferences",
+)
+SESSION_DIRS = ("Default/Local Storage",)
+FICLONE = 0x40049409
+
+
+def clone_dirs(template_dir: str, count: int) -> list[str]:
+    template = Path(template_dir)
+    root = template.with_name(f"{template.name}-clones")
+    return [str(root / str(idx)) for idx in range(1, count + 1)]
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    # Copy-on-write clone where the filesystem supports it (APFS, btrfs,
+    # XFS); the caller falls back to a byte copy otherwise.
+    if sys.platform == "darwin":
+        result = subprocess.run(["cp", "-c", str(src), str(dst)], capture_output=True)
+        return result.returncode == 0
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        with src.open("rb") as source, dst.open("wb") as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def _copy(src: Path, dst: Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dst.with_name(f".{dst.name}.{os.getpid()}.part")
+    try:
+        if _reflink(src, tmp_path):
+            shutil.copystat(src, tmp_path)
+        else:
+            shutil.copy2(src, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _session_sources(template: Path) -> list[Path]:
+    sources = [template / rel for rel in SESSION_FILES]
+    for rel in SESSION_DIRS:
+        folder = template / rel
+        if folder.is_dir():
+            sources.extend(path for path in folder.rglob("*") if path.is_file())
+    return [path for path in sources if path.is_file()]
+
+
+def sync_profile(template_dir: str, clone_dir: str) -> int:
+    """Bring the clone's login state up to date with the template profile.
+
+    Must run while no Chrome has the clone open. Returns the number of files
+    that were copied.
+    """
+    template, clone = Path(template_dir), Path(clone_dir)
+    if not template.is_dir():
+        raise RuntimeError(f"로그인된 Chrome 프로필을 찾을 수 없습니다: {template_dir}")
+    clone.mkdir(parents=True, exist_ok=True)
+    copied = 0
+    for src in _session_sources(template):
+        dst = clone / src.relative_to(template)
+        src_stat = src.stat()
+        try:
+            dst_stat = dst.stat()
+            if dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime_ns >= src_stat.st_mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+        _copy(src, dst)
+        copied += 1
+    return copied
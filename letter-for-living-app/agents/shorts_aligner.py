@@ -0,0 +1,139 @@
+from pathlib import Path
+import subprocess
+
+import numpy as np
+
+from agents.shorts_transcriber import _split_sentences
+
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.02
+
+
+def decode_pcm(audio_path: Path, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    if not audio_path.exists():
+        raise RuntimeError("Audio file not found for alignment.")
+    cmd = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-i",
+        str(audio_path),
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-",
+    ]
+    proc = subprocess.run(cmd, check=True, capture_output=True)
+    samples = np.frombuffer(proc.stdout, dtype=np.int16)
+    return samples.astype(np.float32) / 32768.0
+
+
+def frame_energy_db(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    frame = max(1, int(sample_rate * FRAME_SECONDS))
+    count = len(samples) // frame
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[: count * frame].reshape(count, frame)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20.0 * np.log10(rms + 1e-9)
+
+
+def find_silences(
+    energy_db: np.ndarray,
+    threshold_db: float = 35.0,
+    min_gap: float = 0.12,
+) -> tuple[list[tuple[float, float]], float, float]:
+    if energy_db.size == 0:
+        return [], 0.0, 0.0
+    silent = energy_db < (float(energy_db.max()) - threshold_db)
+    voiced = np.flatnonzero(~silent)
+    if voiced.size == 0:
+        return [], 0.0, 0.0
+    first, last = int(voiced[0]), int(voiced[-1]) + 1
+    gaps: list[tuple[float, float]] = []
+    idx = first
+    while idx < last:
+        if not silent[idx]:
+            idx += 1
+            continue
+        run_start = idx
+        while idx < last and silent[idx]:
+            idx += 1
+        if (idx - run_start) * FRAME_SECONDS >= min_gap:
+            gaps.append((run_start * FRAME_SECONDS, idx * FRAME_SECONDS))
+    return gaps, first * FRAME_SECONDS, last * FRAME_SECONDS
+
+
+def _pick_boundaries(
+    gaps: list[tuple[float, float]],
+    expected: list[float],
+    span: float,
+) -> list[tuple[float, float]]:
+    # Choose one gap per expected boundary, in order, favouring long pauses
+    # close to where the sentence lengths say the boundary should be.
+    longest = max(end - start for start, end in gaps)
+    span = max(span, 1e-6)
+
+    def score(gap: tuple[float, float], target: float) -> float:
+        center = (gap[0] + gap[1]) / 2
+        return (gap[1] - gap[0]) / longest - 2.0 * abs(center - target) / span
+
+    count = len(gaps)
+    need = len(expected)
+    neg = float("-inf")
+    best = [[neg] * count for _ in range(need)]
+    back = [[-1] * count for _ in range(need)]
+    for i in range(count):
+        best[0][i] = score(gaps[i], expected[0])
+    for j in range(1, need):
+        run_best, run_idx = neg, -1
+        for i in range(count):
+            if i > 0 and best[j - 1][i - 1] > run_best:
+                run_best, run_idx = best[j - 1][i - 1], i - 1
+            if run_idx >= 0:
+                best[j][i] = run_best + score(gaps[i], expected[j])
+                back[j][i] = run_idx
+    last = max(range(count), key=lambda i: best[need - 1][i])
+    chosen = [last]
+    for j in range(need - 1, 0, -1):
+        last = back[j][last]
+        chosen.append(last)
+    return [gaps[i] for i in reversed(chosen)]
+
+
+def align_script_to_audio(audio_path: Path, script: str) -> list[dict]:
+    sentences = _split_sentences(" ".join(script.split()))
+    if not sentences:
+        raise RuntimeError("Script is empty for alignment.")
+    energy = frame_energy_db(decode_pcm(audio_path))
+    gaps, voiced_start, voiced_end = find_silences(energy)
+    if voiced_end <= voiced_start:
+        raise RuntimeError("No speech detected in narration audio.")
+    if len(sentences) == 1:
+        return [{"start": voiced_start, "end": voiced_end, "text": sentences[0]}]
+
+    span = voiced_end - voiced_start
+    weights = [max(1, len(sentence)) for sentence in sentences]
+    total = float(sum(weights))
+    expected: list[float] = []
+    acc = 0.0
+    for weight in weights[:-1]:
+        acc += weight
+        expected.append(voiced_start + span * acc / total)
+
+    if len(gaps) >= len(expected):
+        boundaries = _pick_boundaries(gaps, expected, span)
+    else:
+        boundaries = [(point, point) for point in expected]
+
+    segments: list[dict] = []
+    start = voiced_start
+    for sentence, (gap_start, gap_end) in zip(sentences, boundaries):
+        segments.append({"start": start, "end": max(start, gap_start), "text": sentence})
+        start = gap_end
+    segments.append({"start": start, "end": max(start, voiced_end), "text": sentences[-1]})
+    return segments
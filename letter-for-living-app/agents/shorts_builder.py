@@ -1,6 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
+import os
 import re
 import subprocess
+import tempfile
+import threading
+import time
+import uuid
+
+from agents.media_cache import content_key, file_digest, prune_cache, touch
 
 
 def build_shorts_job(
@@ -46,6 +55,30 @@ def build_srt_from_segments(segments: list[dict], output_path: Path) -> Path:
     return output_path
 
 
+SRT_TIMING_RE = re.compile(
+    r"(\d+):(\d+):(\d+)[,.](\d+)\s*-->\s*(\d+):(\d+):(\d+)[,.](\d+)"
+)
+
+
+def _srt_seconds(hours: str, minutes: str, secs: str, millis: str) -> float:
+    return int(hours) * 3600 + int(minutes) * 60 + int(secs) + int(millis) / 1000
+
+
+def read_srt_cues(srt_path: Path) -> list[tuple[float, float, str]]:
+    cues = []
+    for block in re.split(r"\n\s*\n", srt_path.read_text(encoding="utf-8").strip()):
+        lines = block.splitlines()
+        for idx, line in enumerate(lines):
+            match = SRT_TIMING_RE.search(line)
+            if match:
+                groups = match.groups()
+                cues.append(
+                    (_srt_seconds(*groups[:4]), _srt_seconds(*groups[4:]), "\n".join(lines[idx + 1 :]))
+                )
+                break
+    return cues
+
+
 def build_srt(lines: list[str], total_seconds: float, output_path: Path) -> Path:
     cleaned = [line.strip() for line in lines if line.strip()]
     if len(cleaned) <= 1 and cleaned:
@@ -65,6 +98,634 @@ def build_srt(lines: list[str], total_seconds: float, output_path: Path) -> Path
     return output_path
 
 
+FPS = 30
+FRAME_SIZE = (1080, 1920)
+CUT_SIZE = 1080
+XFADE_SECONDS = 0.35
+ZOOM_STEP = 0.0008
+ZOOM_MAX = 1.03
+CUT_CLIP_CRF = 14
+ASPECT_FRAMES = {"9:16": (1080, 1920), "1:1": (1080, 1080), "16:9": (1920, 1080)}
+THUMBNAIL_INTERVAL = 2.0
+THUMBNAIL_WIDTH = 270
+
+RENDER_PROFILES = {
+    "final": {
+        "scale": 1.0,
+        "fps": FPS,
+        "preset": "medium",
+        "crf": 23,
+        "threads": 0,
+        "noise": True,
+    },
+    "preview": {
+        "scale": 0.5,
+        "fps": 15,
+        "preset": "ultrafast",
+        "crf": 30,
+        "threads": 0,
+        "noise": False,
+    },
+}
+
+
+def _even(value: float) -> int:
+    return max(2, int(round(value / 2)) * 2)
+
+
+def resolve_render_profile(name: str = "final", overrides: dict | None = None) -> dict:
+    if name not in RENDER_PROFILES:
+        raise RuntimeError(f"알 수 없는 렌더 프로필입니다: {name}")
+    profile = dict(RENDER_PROFILES[name])
+    profile.update({key: value for key, value in (overrides or {}).items() if value is not None})
+    profile["name"] = name
+    profile["fps"] = int(profile["fps"])
+    profile["threads"] = int(profile["threads"])
+    profile["frame_size"] = (
+        _even(FRAME_SIZE[0] * profile["scale"]),
+        _even(FRAME_SIZE[1] * profile["scale"]),
+    )
+    profile["cut_size"] = _even(CUT_SIZE * profile["scale"])
+    return profile
+
+
+def aspect_profile(profile: dict, aspect: str) -> dict:
+    if aspect not in ASPECT_FRAMES:
+        raise RuntimeError(f"지원하지 않는 화면 비율입니다: {aspect}")
+    width, height = ASPECT_FRAMES[aspect]
+    return {
+        **profile,
+        "frame_size": (_even(width * profile["scale"]), _even(height * profile["scale"])),
+    }
+
+
+def _codec_args(profile: dict, threads: int | None = None) -> list[str]:
+    return [
+        "-c:v",
+        "libx264",
+        "-preset",
+        str(profile["preset"]),
+        "-crf",
+        str(profile["crf"]),
+        "-threads",
+        str(profile["threads"] if threads is None else threads),
+        "-pix_fmt",
+        "yuv420p",
+    ]
+
+
+def _cut_duration(total_seconds: float, count: int, xfade_d: float = XFADE_SECONDS) -> float:
+    return (total_seconds + (count - 1) * xfade_d) / count
+
+
+def _cut_filter(
+    input_idx: int, frames: int, label: str, profile: dict, start_frame: int = 0
+) -> str:
+    # The still image is scaled and padded once, then zoompan emits every
+    # frame of the cut from that single decoded picture.
+    size = profile["cut_size"]
+    zoom_step = ZOOM_STEP * FPS / profile["fps"]
+    return (
+        f"[{input_idx}:v]scale={size}:{size}:force_original_aspect_ratio=decrease,"
+        f"pad={size}:{size}:(ow-iw)/2:(oh-ih)/2:color=black,format=yuv420p,"
+        f"zoompan=z='min(1+{zoom_step:.6f}*(on+{start_frame + 1}),{ZOOM_MAX})'"
+        f":x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)':d={frames}"
+        f":s={size}x{size}:fps={profile['fps']}[{label}]"
+    )
+
+
+def _xfade_chain(labels: list[str], per_cut: float, xfade_d: float, out_label: str) -> str:
+    if len(labels) == 1:
+        return f"[{labels[0]}]null[{out_label}]"
+    parts = []
+    prev = labels[0]
+    for idx in range(1, len(labels)):
+        offset = (idx * per_cut) - (idx * xfade_d)
+        out = out_label if idx == len(labels) - 1 else f"vxf{idx}"
+        parts.append(
+            f"[{prev}][{labels[idx]}]xfade=transition=fade:duration={xfade_d}:offset={offset:.2f}[{out}]"
+        )
+        prev = out
+    return ";".join(parts)
+
+
+def _grade_filter(profile: dict | None = None) -> str:
+    if profile is not None and not profile["noise"]:
+        return "eq=saturation=1.05:contrast=1.02"
+    return "eq=saturation=1.05:contrast=1.02,noise=alls=6:allf=t"
+
+
+def _text_filter(title: str, srt_path: Path | None, profile: dict | None = None) -> str:
+    scale = profile["scale"] if profile else 1.0
+    parts = []
+    if title:
+        parts.append(
+            f"drawtext=text='{_escape_drawtext(title)}':x=(w-text_w)/2:y={round(90 * scale)}"
+            f":fontsize={round(64 * scale)}:fontcolor=white:shadowx=2:shadowy=2"
+        )
+    if srt_path is not None:
+        parts.append(
+            f"subtitles={srt_path}:force_style='FontName=Helvetica,Fontsize=48,Outline=2,Shadow=1,Alignment=2,MarginV=180'"
+        )
+    return ",".join(parts) or "null"
+
+
+def _overlay_filter(
+    title: str, srt_path: Path | None, profile: dict, time_offset: float = 0.0
+) -> str:
+    width, height = profile["frame_size"]
+    text = _text_filter(title, srt_path, profile)
+    if time_offset and srt_path is not None:
+        # Chunks start at PTS 0; shift them onto the full timeline so the
+        # subtitle cues line up, then rebase for the concat demuxer.
+        text = f"setpts=PTS+{time_offset:.6f}/TB,{text},setpts=PTS-STARTPTS"
+    return f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2:color=black,{text}"
+
+
+def concat_streams(paths: list[Path], output_path: Path, extra_args: list[str] | None = None) -> Path:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", dir=output_path.parent, delete=False, encoding="utf-8"
+    ) as f:
+        for path in paths:
+            escaped = str(path.resolve()).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+        list_path = Path(f.name)
+    try:
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-v",
+            "error",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            str(list_path),
+            "-c",
+            "copy",
+            *(extra_args or []),
+            str(output_path),
+        ]
+        subprocess.run(cmd, check=True)
+    finally:
+        list_path.unlink(missing_ok=True)
+    return output_path
+
+
+def probe_duration(path: Path) -> float:
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "default=noprint_wrappers=1:nokey=1",
+        str(path),
+    ]
+    proc = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    try:
+        return float(proc.stdout.strip())
+    except ValueError:
+        raise RuntimeError(f"미디어 길이를 확인할 수 없습니다: {path.name}")
+
+
+def _audio_codec_args(audio_path: Path) -> list[str]:
+    # AAC narration (.m4a/.aac) can go into the MP4 untouched.
+    if audio_path.suffix.lower() in (".m4a", ".aac", ".mp4"):
+        return ["-c:a", "copy"]
+    return ["-c:a", "aac", "-b:a", "128k"]
+
+
+def mux_audio(
+    video_path: Path,
+    audio_path: Path,
+    output_path: Path,
+    soft_srt_path: Path | None = None,
+    video_seconds: float | None = None,
+) -> Path:
+    inputs = ["-i", str(video_path), "-i", str(audio_path)]
+    maps = ["-map", "0:v", "-map", "1:a"]
+    tail = ["-shortest"]
+    if soft_srt_path is not None:
+        inputs.extend(["-i", str(soft_srt_path)])
+        maps.extend(["-map", "2:s", "-c:s", "mov_text"])
+        # -shortest would stop at the last subtitle cue, so trim explicitly.
+        seconds = min(video_seconds or probe_duration(video_path), probe_duration(audio_path))
+        tail = ["-t", f"{seconds:.3f}"]
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-v",
+        "error",
+        *inputs,
+        *maps,
+        "-c:v",
+        "copy",
+        *_audio_codec_args(audio_path),
+        *tail,
+        "-movflags",
+        "+faststart",
+        str(output_path),
+    ]
+    subprocess.run(cmd, check=True)
+    return output_path
+
+
+def progress_reporter(callback: Callable[[dict], None], interval: float = 1.0):
+    # Several ffmpeg processes can report at once (cut clips, parallel
+    # chunks); their frames are summed so the job has a single percentage.
+    started = time.monotonic()
+    lock = threading.Lock()
+    totals: dict[str, int] = {}
+    done: dict[str, int] = {}
+    rates: dict[str, float] = {}
+    last_emit = [0.0]
+
+    def report(key: str, frame: int, total: int, fps: float = 0.0, final: bool = False) -> None:
+        with lock:
+            totals[key] = max(1, total)
+            done[key] = totals[key] if final else min(frame, totals[key])
+            rates[key] = 0.0 if final else fps
+            now = time.monotonic()
+            if not final and (frame == 0 or now - last_emit[0] < interval):
+                return
+            last_emit[0] = now
+            total_frames = sum(totals.values())
+            done_frames = sum(done.values())
+            elapsed = now - started
+            speed = done_frames / elapsed if elapsed > 0 else 0.0
+            callback(
+                {
+                    "percent": round(100.0 * done_frames / total_frames, 1),
+                    "frames": done_frames,
+                    "total_frames": total_frames,
+                    "fps": round(sum(rates.values()), 1),
+                    "elapsed": round(elapsed, 1),
+                    "eta": round((total_frames - done_frames) / speed, 1) if speed > 0 else None,
+                }
+            )
+
+    return report
+
+
+def _progress_value(value: str | None, cast):
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return cast(0)
+
+
+def run_ffmpeg(
+    cmd: list[str],
+    report: Callable | None = None,
+    key: str = "render",
+    total_frames: int = 0,
+) -> None:
+    if report is None:
+        subprocess.run(cmd, check=True)
+        return
+    # -progress writes key=value blocks to stdout, each one closed by a
+    # "progress=continue" (or "progress=end") line.
+    cmd = [cmd[0], "-progress", "pipe:1", "-stats_period", "0.5", "-nostats", *cmd[1:]]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    block: dict[str, str] = {}
+    for line in proc.stdout:
+        name, _, value = line.strip().partition("=")
+        if name != "progress":
+            block[name] = value
+            continue
+        report(
+            key,
+            _progress_value(block.get("frame"), int),
+            total_frames,
+            _progress_value(block.get("fps"), float),
+            final=value == "end",
+        )
+        block = {}
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def _thumbnail_output(parts: list[str], thumbnail_path: Path | None) -> list[str]:
+    # A split branch keeps overwriting one small JPEG while the track is
+    # encoded, so the status page can show the render in progress.
+    if thumbnail_path is None:
+        return []
+    thumbnail_path.parent.mkdir(parents=True, exist_ok=True)
+    parts[-1] = parts[-1][: -len("[v]")] + "[vfull]"
+    parts.append(
+        f"[vfull]split[v][vthumb];"
+        f"[vthumb]fps=1/{THUMBNAIL_INTERVAL:g},scale={THUMBNAIL_WIDTH}:-2[thumb]"
+    )
+    return [
+        "-map",
+        "[thumb]",
+        "-update",
+        "1",
+        "-atomic_writing",
+        "1",
+        "-q:v",
+        "5",
+        str(thumbnail_path),
+    ]
+
+
+def _chunk_plan(count: int, per_cut: float, xfade_d: float, fps: int) -> list[dict]:
+    # Chunk k starts where the transition into cut k begins, so it carries
+    # the tail of cut k-1 for the xfade and cut k up to the next transition.
+    cut_frames = max(1, round(per_cut * fps))
+    xf_frames = min(cut_frames - 1, max(1, round(xfade_d * fps))) if count > 1 else 0
+    step = cut_frames - xf_frames
+    plan = []
+    for idx in range(count):
+        plan.append(
+            {
+                "index": idx,
+                "start": idx * step / fps,
+                "frames": cut_frames if idx == count - 1 else step,
+                "prev_start_frame": step,
+                "xfade_frames": xf_frames if idx > 0 else 0,
+            }
+        )
+    return plan
+
+
+def _render_chunk(
+    image_paths: list[Path],
+    chunk: dict,
+    title: str,
+    srt_path: Path | None,
+    output_path: Path,
+    profile: dict,
+    threads: int,
+    report: Callable | None = None,
+    thumbnail_path: Path | None = None,
+) -> Path:
+    idx = chunk["index"]
+    fps = profile["fps"]
+    inputs: list[str] = []
+    parts: list[str] = []
+    if chunk["xfade_frames"]:
+        inputs.extend(["-i", str(image_paths[idx - 1]), "-i", str(image_paths[idx])])
+        parts.append(
+            _cut_filter(
+                0, chunk["xfade_frames"], "prev", profile, start_frame=chunk["prev_start_frame"]
+            )
+        )
+        parts.append(_cut_filter(1, chunk["frames"], "cur", profile))
+        parts.append(
+            f"[prev][cur]xfade=transition=fade:duration={chunk['xfade_frames'] / fps:.6f}:offset=0[vx]"
+        )
+    else:
+        inputs.extend(["-i", str(image_paths[idx])])
+        parts.append(_cut_filter(0, chunk["frames"], "vx", profile))
+    parts.append(
+        f"[vx]{_grade_filter(profile)},{_overlay_filter(title, srt_path, profile, chunk['start'])}[v]"
+    )
+    thumbnail_args = _thumbnail_output(parts, thumbnail_path)
+    tmp_path = output_path.with_name(f".{output_path.stem}.{uuid.uuid4().hex}.mp4")
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-v",
+        "error",
+        *inputs,
+        "-filter_complex",
+        ";".join(parts),
+        "-map",
+        "[v]",
+        "-frames:v",
+        str(chunk["frames"]),
+        *_codec_args(profile, threads),
+        "-an",
+        "-r",
+        str(fps),
+        str(tmp_path),
+        *thumbnail_args,
+    ]
+    try:
+        run_ffmpeg(cmd, report, f"chunk:{idx}", chunk["frames"])
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return output_path
+
+
+def chunk_cache_path(
+    digests: list[str],
+    chunk: dict,
+    title: str,
+    srt_path: Path | None,
+    cues: list[tuple[float, float, str]],
+    profile: dict,
+    cache_dir: Path,
+) -> Path:
+    # A chunk is final, graded and captioned video, so its key covers
+    # everything drawn into its window: the cut image(s), the timing, the
+    # title and only the subtitle cues that overlap the window.
+    idx = chunk["index"]
+    end = chunk["start"] + chunk["frames"] / profile["fps"]
+    window = [cue for cue in cues if cue[0] < end and cue[1] > chunk["start"]]
+    key = content_key(
+        digests[idx - 1] if chunk["xfade_frames"] else "",
+        digests[idx],
+        chunk["start"],
+        chunk["frames"],
+        chunk["xfade_frames"],
+        chunk["prev_start_frame"],
+        window,
+        _grade_filter(profile),
+        _overlay_filter(title, None if srt_path is None else Path("cues.srt"), profile),
+        ZOOM_STEP,
+        ZOOM_MAX,
+        *[profile[key] for key in ("fps", "cut_size", "preset", "crf")],
+    )
+    return cache_dir / f"{key}.mp4"
+
+
+def _build_parallel(
+    image_paths: list[Path],
+    audio_path: Path,
+    title: str,
+    output_path: Path,
+    per_cut: float,
+    xfade_d: float,
+    srt_path: Path | None,
+    profile: dict,
+    workers: int | None,
+    soft_srt_path: Path | None = None,
+    report: Callable | None = None,
+    cache_dir: Path | None = None,
+    thumbnail_path: Path | None = None,
+) -> Path:
+    # With a cache_dir, finished chunks are kept by content, so a new image,
+    # title or subtitle line only re-encodes the chunks it shows up in; the
+    # rest is stream-copied into the new timeline.
+    plan = _chunk_plan(len(image_paths), per_cut, xfade_d, profile["fps"])
+    seconds = sum(chunk["frames"] for chunk in plan) / profile["fps"]
+    with tempfile.TemporaryDirectory(dir=output_path.parent, prefix=".chunks-") as tmp:
+        tmp_dir = Path(tmp)
+        if cache_dir is None:
+            chunk_paths = [tmp_dir / f"chunk_{chunk['index']:03d}.mp4" for chunk in plan]
+        else:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            digests = [file_digest(path) for path in image_paths]
+            cues = read_srt_cues(srt_path) if srt_path is not None else []
+            chunk_paths = [
+                chunk_cache_path(digests, chunk, title, srt_path, cues, profile, cache_dir)
+                for chunk in plan
+            ]
+        pending = []
+        for chunk, chunk_path in zip(plan, chunk_paths):
+            if chunk_path.exists() and chunk_path.stat().st_size > 0:
+                touch(chunk_path)
+                if report is not None:
+                    report(f"chunk:{chunk['index']}", chunk["frames"], chunk["frames"], final=True)
+                continue
+            pending.append((chunk, chunk_path))
+            if report is not None:
+                report(f"chunk:{chunk['index']}", 0, chunk["frames"])
+        cores = os.cpu_count() or 1
+        workers = max(1, min(workers or cores, len(pending) or 1))
+        threads = profile["threads"] or max(1, cores // workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _render_chunk,
+                    image_paths,
+                    chunk,
+                    title,
+                    srt_path,
+                    chunk_path,
+                    profile,
+                    threads,
+                    report,
+                    thumbnail_path,
+                )
+                for chunk, chunk_path in pending
+            ]
+            for future in futures:
+                future.result()
+        timeline = concat_streams(chunk_paths, tmp_dir / "timeline.mp4")
+        mux_audio(timeline, audio_path, output_path, soft_srt_path, seconds)
+    return output_path
+
+
+def cut_clip_path(image_path: Path, frames: int, profile: dict, cache_dir: Path) -> Path:
+    key = content_key(
+        file_digest(image_path),
+        frames,
+        profile["fps"],
+        profile["cut_size"],
+        ZOOM_STEP,
+        ZOOM_MAX,
+        profile["preset"],
+        CUT_CLIP_CRF,
+    )
+    return cache_dir / f"{key}.mp4"
+
+
+def render_cut_clip(
+    image_path: Path,
+    frames: int,
+    profile: dict,
+    cache_dir: Path,
+    threads: int = 0,
+    report: Callable | None = None,
+) -> Path:
+    clip_path = cut_clip_path(image_path, frames, profile, cache_dir)
+    key = clip_path.stem
+    if clip_path.exists() and clip_path.stat().st_size > 0:
+        touch(clip_path)
+        return clip_path
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_dir / f".{key}.{uuid.uuid4().hex}.mp4"
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-v",
+        "error",
+        "-i",
+        str(image_path),
+        "-filter_complex",
+        _cut_filter(0, frames, "v", profile),
+        "-map",
+        "[v]",
+        "-frames:v",
+        str(frames),
+        *_codec_args({**profile, "crf": CUT_CLIP_CRF}, threads),
+        "-an",
+        str(tmp_path),
+    ]
+    try:
+        run_ffmpeg(cmd, report, f"cut:{key}", frames)
+        os.replace(tmp_path, clip_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return clip_path
+
+
+def render_cut_clips(
+    image_paths: list[Path],
+    frames: int,
+    profile: dict,
+    cache_dir: Path,
+    workers: int,
+    threads: int = 0,
+    report: Callable | None = None,
+) -> list[Path]:
+    # A script may reuse an image for several cuts; each distinct clip is
+    # encoded once and the results are mapped back onto the cut order.
+    clips = [cut_clip_path(path, frames, profile, cache_dir) for path in image_paths]
+    unique = dict(zip(clips, image_paths))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(unique)))) as pool:
+        list(
+            pool.map(
+                lambda path: render_cut_clip(path, frames, profile, cache_dir, threads, report),
+                unique.values(),
+            )
+        )
+    return clips
+
+
+def _clip_xfade_chain(count: int, step: int, xf_frames: int, fps: int, out_label: str) -> str:
+    # Pre-rendered cut clips are inputs 0..count-1; offsets are whole frames.
+    if count == 1:
+        return f"[0:v]null[{out_label}]"
+    parts = []
+    prev = "0:v"
+    for idx in range(1, count):
+        out = out_label if idx == count - 1 else f"vxf{idx}"
+        parts.append(
+            f"[{prev}][{idx}:v]xfade=transition=fade:duration={xf_frames / fps:.6f}"
+            f":offset={idx * step / fps:.6f}[{out}]"
+        )
+        prev = out
+    return ";".join(parts)
+
+
+def _legacy_filter_complex(
+    image_count: int, per_cut: float, xfade_d: float, title: str, srt_path: Path
+) -> str:
+    frames = max(1, int(per_cut * FPS))
+    segments = []
+    for idx in range(image_count):
+        segments.append(
+            f"color=c=black:s=1080x1920[bg{idx}];"
+            f"[{idx}:v]scale=1080:1080:force_original_aspect_ratio=decrease,"
+            f"pad=1080:1080:(ow-iw)/2:(oh-ih)/2:color=black@0,"
+            f"zoompan=z='min(zoom+0.0008,1.03)':x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)':d={frames}:s=1080x1080[fgz{idx}];"
+            f"[bg{idx}][fgz{idx}]overlay=(W-w)/2:(H-h)/2,format=yuv420p[v{idx}]"
+        )
+    filter_complex = ";".join(segments)
+    filter_complex += ";" + _xfade_chain([f"v{idx}" for idx in range(image_count)], per_cut, xfade_d, "vx")
+    filter_complex += f";[vx]{_grade_filter()},{_text_filter(title, srt_path)}[v]"
+    return filter_complex
+
+
 def build_short_video(
     image_paths: list[Path],
     audio_path: Path,
@@ -74,6 +735,16 @@ def build_short_video(
     total_seconds: float = 60.0,
     srt_path: Path | None = None,
     font_path: Path | None = None,
+    optimized: bool = True,
+    parallel: bool = False,
+    workers: int | None = None,
+    profile: str = "final",
+    profile_overrides: dict | None = None,
+    cache_dir: Path | None = None,
+    cache_max_bytes: int = 1024 * 1024 * 1024,
+    subtitle_mode: str = "burn",
+    on_progress: Callable[[dict], None] | None = None,
+    thumbnail_path: Path | None = None,
 ) -> Path:
     if not image_paths:
         raise RuntimeError("이미지 경로가 비어 있습니다.")
@@ -84,65 +755,201 @@ def build_short_video(
         srt_path = output_path.with_suffix(".srt")
         lines = [line for line in script.splitlines() if line.strip()]
         build_srt(lines, total_seconds, srt_path)
-    xfade_d = 0.35
-    per_cut = (total_seconds + (len(image_paths) - 1) * xfade_d) / len(image_paths)
+    render_profile = resolve_render_profile(profile, profile_overrides)
+    if subtitle_mode not in ("burn", "soft"):
+        raise RuntimeError(f"알 수 없는 자막 모드입니다: {subtitle_mode}")
+    burn_srt_path = srt_path if subtitle_mode == "burn" else None
+    soft_srt_path = srt_path if subtitle_mode == "soft" else None
+    report = progress_reporter(on_progress) if on_progress is not None else None
+    xfade_d = XFADE_SECONDS
+    per_cut = _cut_duration(total_seconds, len(image_paths), xfade_d)
+    if not optimized:
+        inputs = []
+        for path in image_paths:
+            inputs.extend(["-loop", "1", "-t", f"{per_cut:.2f}", "-i", str(path)])
+        filter_complex = _legacy_filter_complex(len(image_paths), per_cut, xfade_d, title, srt_path)
+        cmd = [
+            "ffmpeg",
+            "-y",
+            *inputs,
+            "-i",
+            str(audio_path),
+            "-filter_complex",
+            filter_complex,
+            "-map",
+            "[v]",
+            "-map",
+            f"{len(image_paths)}:a",
+            "-c:v",
+            "libx264",
+            "-c:a",
+            "aac",
+            "-b:a",
+            "128k",
+            "-shortest",
+            "-r",
+            str(FPS),
+            str(output_path),
+        ]
+        subprocess.run(cmd, check=True)
+        return output_path
+    if parallel or cache_dir is not None:
+        _build_parallel(
+            image_paths,
+            audio_path,
+            title,
+            output_path,
+            per_cut,
+            xfade_d,
+            burn_srt_path,
+            render_profile,
+            workers if parallel else 1,
+            soft_srt_path,
+            report,
+            cache_dir / "chunks" if cache_dir is not None else None,
+            thumbnail_path,
+        )
+        if cache_dir is not None:
+            prune_cache(cache_dir / "chunks", max_bytes=cache_max_bytes)
+        return output_path
+    # One decoded frame per image is enough: zoompan generates the motion
+    # and the grade runs on the 1080x1080 cut before it is padded.
+    fps = render_profile["fps"]
+    frames = max(1, round(per_cut * fps))
+    total_frames = sum(
+        chunk["frames"] for chunk in _chunk_plan(len(image_paths), per_cut, xfade_d, fps)
+    )
     inputs = []
     for path in image_paths:
-        inputs.extend(["-loop", "1", "-t", f"{per_cut:.2f}", "-i", str(path)])
-    frames = max(1, int(per_cut * 30))
-    segments = []
-    for idx in range(len(image_paths)):
-        segments.append(
-            f"color=c=black:s=1080x1920[bg{idx}];"
-            f"[{idx}:v]scale=1080:1080:force_original_aspect_ratio=decrease,"
-            f"pad=1080:1080:(ow-iw)/2:(oh-ih)/2:color=black@0,"
-            f"zoompan=z='min(zoom+0.0008,1.03)':x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)':d={frames}:s=1080x1080[fgz{idx}];"
-            f"[bg{idx}][fgz{idx}]overlay=(W-w)/2:(H-h)/2,format=yuv420p[v{idx}]"
+        inputs.extend(["-i", str(path)])
+    labels = [f"v{idx}" for idx in range(len(image_paths))]
+    parts = [_cut_filter(idx, frames, label, render_profile) for idx, label in enumerate(labels)]
+    parts.append(_xfade_chain(labels, per_cut, xfade_d, "vx"))
+    parts.append(
+        f"[vx]{_grade_filter(render_profile)},{_overlay_filter(title, burn_srt_path, render_profile)}[v]"
+    )
+    thumbnail_args = _thumbnail_output(parts, thumbnail_path)
+    with tempfile.TemporaryDirectory(dir=output_path.parent, prefix=".track-") as tmp:
+        track_path = Path(tmp) / "video.mp4"
+        cmd = [
+            "ffmpeg",
+            "-y",
+            *inputs,
+            "-filter_complex",
+            ";".join(parts),
+            "-map",
+            "[v]",
+            *_codec_args(render_profile),
+            "-an",
+            "-r",
+            str(fps),
+            str(track_path),
+            *thumbnail_args,
+        ]
+        run_ffmpeg(cmd, report, "track", total_frames)
+        mux_audio(track_path, audio_path, output_path, soft_srt_path, total_seconds)
+    return output_path
+
+
+def variant_path(output_path: Path, aspect: str) -> Path:
+    return output_path.with_name(f"{output_path.stem}_{aspect.replace(':', 'x')}{output_path.suffix}")
+
+
+def build_short_variants(
+    image_paths: list[Path],
+    audio_path: Path,
+    script: str,
+    title: str,
+    output_path: Path,
+    aspects: tuple[str, ...] = tuple(ASPECT_FRAMES),
+    total_seconds: float = 60.0,
+    srt_path: Path | None = None,
+    workers: int | None = None,
+    profile: str = "final",
+    profile_overrides: dict | None = None,
+    cache_dir: Path | None = None,
+    cache_max_bytes: int = 1024 * 1024 * 1024,
+    subtitle_mode: str = "burn",
+    on_progress: Callable[[dict], None] | None = None,
+) -> dict[str, Path]:
+    if not image_paths:
+        raise RuntimeError("이미지 경로가 비어 있습니다.")
+    if not audio_path.exists() or audio_path.stat().st_size == 0:
+        raise RuntimeError("나레이션 오디오가 비어 있습니다.")
+    if not aspects:
+        raise RuntimeError("화면 비율을 하나 이상 선택해 주세요.")
+    if subtitle_mode not in ("burn", "soft"):
+        raise RuntimeError(f"알 수 없는 자막 모드입니다: {subtitle_mode}")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if srt_path is None:
+        srt_path = output_path.with_suffix(".srt")
+        lines = [line for line in script.splitlines() if line.strip()]
+        build_srt(lines, total_seconds, srt_path)
+    render_profile = resolve_render_profile(profile, profile_overrides)
+    branches = [aspect_profile(render_profile, aspect) for aspect in aspects]
+    burn_srt_path = srt_path if subtitle_mode == "burn" else None
+    soft_srt_path = srt_path if subtitle_mode == "soft" else None
+    report = progress_reporter(on_progress) if on_progress is not None else None
+    fps = render_profile["fps"]
+    per_cut = _cut_duration(total_seconds, len(image_paths), XFADE_SECONDS)
+    plan = _chunk_plan(len(image_paths), per_cut, XFADE_SECONDS, fps)
+    cut_frames = plan[-1]["frames"]
+    total_frames = sum(chunk["frames"] for chunk in plan)
+
+    # Every cut is decoded and animated once; the graded timeline is then
+    # split into one pad/overlay/encode branch per aspect ratio.
+    inputs: list[str] = []
+    if cache_dir is not None:
+        cores = os.cpu_count() or 1
+        workers = max(1, min(workers or cores, len(image_paths)))
+        threads = render_profile["threads"] or max(1, cores // workers)
+        if report is not None:
+            pending = {
+                cut_clip_path(path, cut_frames, render_profile, cache_dir / "cuts")
+                for path in image_paths
+            }
+            for clip in pending:
+                if not clip.exists():
+                    report(f"cut:{clip.stem}", 0, cut_frames)
+            report("variants", 0, total_frames)
+        clips = render_cut_clips(
+            image_paths, cut_frames, render_profile, cache_dir / "cuts", workers, threads, report
         )
-    filter_complex = ";".join(segments)
-    if len(image_paths) == 1:
-        filter_complex += ";[v0]eq=saturation=1.05:contrast=1.02,noise=alls=6:allf=t"
-        filter_complex += f",drawtext=text='{_escape_drawtext(title)}':x=(w-text_w)/2:y=90:fontsize=64:fontcolor=white:shadowx=2:shadowy=2"
-        filter_complex += f",subtitles={srt_path}:force_style='FontName=Helvetica,Fontsize=48,Outline=2,Shadow=1,Alignment=2,MarginV=180'[v]"
+        for clip in clips:
+            inputs.extend(["-i", str(clip)])
+        parts = [
+            _clip_xfade_chain(
+                len(clips), plan[0]["prev_start_frame"], plan[-1]["xfade_frames"], fps, "vx"
+            )
+        ]
     else:
-        xfade_parts = []
-        prev = "v0"
-        for idx in range(1, len(image_paths)):
-            offset = (idx * per_cut) - (idx * xfade_d)
-            out = f"vxf{idx}"
-            xfade_parts.append(
-                f"[{prev}][v{idx}]xfade=transition=fade:duration={xfade_d}:offset={offset:.2f}[{out}]"
+        frames = max(1, round(per_cut * fps))
+        labels = [f"v{idx}" for idx in range(len(image_paths))]
+        for path in image_paths:
+            inputs.extend(["-i", str(path)])
+        parts = [_cut_filter(idx, frames, label, render_profile) for idx, label in enumerate(labels)]
+        parts.append(_xfade_chain(labels, per_cut, XFADE_SECONDS, "vx"))
+    split_labels = "".join(f"[s{idx}]" for idx in range(len(branches)))
+    parts.append(f"[vx]{_grade_filter(render_profile)},split={len(branches)}{split_labels}")
+    for idx, branch in enumerate(branches):
+        parts.append(f"[s{idx}]{_overlay_filter(title, burn_srt_path, branch)}[out{idx}]")
+
+    outputs: dict[str, Path] = {}
+    with tempfile.TemporaryDirectory(dir=output_path.parent, prefix=".variants-") as tmp:
+        tracks = [Path(tmp) / f"track_{idx}.mp4" for idx in range(len(branches))]
+        cmd = ["ffmpeg", "-y", *inputs, "-filter_complex", ";".join(parts)]
+        for idx, track in enumerate(tracks):
+            cmd.extend(
+                ["-map", f"[out{idx}]", *_codec_args(render_profile), "-an", "-r", str(fps), str(track)]
             )
-            prev = out
-        filter_complex += ";" + ";".join(xfade_parts)
-        filter_complex += f";[{prev}]eq=saturation=1.05:contrast=1.02,noise=alls=6:allf=t"
-        filter_complex += f",drawtext=text='{_escape_drawtext(title)}':x=(w-text_w)/2:y=90:fontsize=64:fontcolor=white:shadowx=2:shadowy=2"
-        filter_complex += f",subtitles={srt_path}:force_style='FontName=Helvetica,Fontsize=48,Outline=2,Shadow=1,Alignment=2,MarginV=180'[v]"
-    cmd = [
-        "ffmpeg",
-        "-y",
-        *inputs,
-        "-i",
-        str(audio_path),
-        "-filter_complex",
-        filter_complex,
-        "-map",
-        "[v]",
-        "-map",
-        f"{len(image_paths)}:a",
-        "-c:v",
-        "libx264",
-        "-c:a",
-        "aac",
-        "-b:a",
-        "128k",
-        "-shortest",
-        "-r",
-        "30",
-        str(output_path),
-    ]
-    subprocess.run(cmd, check=True)
-    return output_path
+        run_ffmpeg(cmd, report, "variants", total_frames)
+        for aspect, track in zip(aspects, tracks):
+            outputs[aspect] = mux_audio(
+                track, audio_path, variant_path(output_path, aspect), soft_srt_path, total_frames / fps
+            )
+    if cache_dir is not None:
+        prune_cache(cache_dir / "cuts", max_bytes=cache_max_bytes)
+    return outputs
 
 
 def _escape_drawtext(text: str) -> str:
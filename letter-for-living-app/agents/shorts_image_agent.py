@@ -1,9 +1,17 @@
 from typing import Iterable
 from pathlib import Path
-import base64
 import os
 import requests
 
+from agents.image_pipeline import (
+    IMAGE_FORMATS,
+    UPLOAD_CHUNK_SIZE,
+    download_to,
+    ensure_image_format,
+    image_format_request,
+    stream_image_response,
+)
+
 
 def summarize_image_prompts(image_prompts: Iterable[str]) -> str:
     prompts = [prompt.strip() for prompt in image_prompts if prompt and prompt.strip()]
@@ -30,6 +38,8 @@ def generate_images(
     output_dir: Path,
     model: str = "gpt-image-1-mini",
     size: str = "1024x1024",
+    output_format: str = "jpeg",
+    output_compression: int | None = 85,
 ) -> list[Path]:
     api_key = os.environ.get("OPENAI_API_KEY", "")
     if not api_key:
@@ -43,26 +53,23 @@ def generate_images(
             "prompt": prompt,
             "size": size,
             "quality": "low",
+            **image_format_request(output_format, output_compression),
         }
-        resp = requests.post(
+        out_path = output_dir / f"shorts_cut_{idx}{IMAGE_FORMATS[output_format]}"
+        with requests.post(
             "https://api.openai.com/v1/images/generations",
             headers={"Authorization": f"Bearer {api_key}"},
             json=payload,
             timeout=120,
-        )
-        if resp.status_code >= 400:
-            raise RuntimeError(f"OpenAI image error {resp.status_code}: {resp.text}")
-        data = resp.json()
-        image_item = data["data"][0]
-        if "b64_json" in image_item:
-            image_bytes = base64.b64decode(image_item["b64_json"])
-        elif "url" in image_item:
-            image_resp = requests.get(image_item["url"], timeout=60)
-            image_resp.raise_for_status()
-            image_bytes = image_resp.content
-        else:
-            raise RuntimeError("Image response does not include b64_json or url.")
-        out_path = output_dir / f"shorts_cut_{idx}.png"
-        out_path.write_bytes(image_bytes)
-        paths.append(out_path)
+            stream=True,
+        ) as resp:
+            if resp.status_code >= 400:
+                raise RuntimeError(f"OpenAI image error {resp.status_code}: {resp.text}")
+            body, written = stream_image_response(resp.iter_content(UPLOAD_CHUNK_SIZE), out_path)
+        if not written:
+            image_item = (body.get("data") or [{}])[0]
+            if "url" not in image_item:
+                raise RuntimeError("Image response does not include b64_json or url.")
+            download_to(image_item["url"], out_path)
+        paths.append(ensure_image_format(out_path, output_format, output_compression))
     return paths
@@ -1,23 +1,43 @@
 from pathlib import Path
+import json
 import os
 import re
 import requests
 
+from agents.media_cache import content_key, file_digest, prune_cache, touch
 
-def transcribe_with_timestamps(audio_path: Path) -> list[dict]:
+
+def transcribe_with_timestamps(
+    audio_path: Path,
+    model: str = "whisper-1",
+    granularity: str = "segment",
+    cache_dir: Path | None = None,
+    cache_max_entries: int = 200,
+) -> list[dict]:
+    if not audio_path.exists():
+        raise RuntimeError("Audio file not found for transcription.")
+    cache_path = None
+    if cache_dir is not None:
+        key = content_key(file_digest(audio_path), model, granularity)
+        cache_path = cache_dir / f"{key}.json"
+        if cache_path.exists():
+            try:
+                segments = json.loads(cache_path.read_text(encoding="utf-8"))
+                touch(cache_path)
+                return segments
+            except json.JSONDecodeError:
+                pass
     api_key = os.environ.get("OPENAI_API_KEY", "")
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is not set")
-    if not audio_path.exists():
-        raise RuntimeError("Audio file not found for transcription.")
     with audio_path.open("rb") as f:
         resp = requests.post(
             "https://api.openai.com/v1/audio/transcriptions",
             headers={"Authorization": f"Bearer {api_key}"},
             data=[
-                ("model", "whisper-1"),
+                ("model", model),
                 ("response_format", "verbose_json"),
-                ("timestamp_granularities[]", "segment"),
+                ("timestamp_granularities[]", granularity),
             ],
             files={"file": f},
             timeout=120,
@@ -25,7 +45,12 @@ def transcribe_with_timestamps(audio_path: Path) -> list[dict]:
     if resp.status_code >= 400:
         raise RuntimeError(f"OpenAI STT error {resp.status_code}: {resp.text}")
     data = resp.json()
-    return data.get("segments", [])
+    segments = data.get("segments", [])
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(segments, ensure_ascii=False), encoding="utf-8")
+        prune_cache(cache_path.parent, max_entries=cache_max_entries)
+    return segments
 
 
 def merge_segments_by_sentence(segments: list[dict]) -> list[dict]:
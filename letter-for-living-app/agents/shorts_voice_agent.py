@@ -1,24 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import json
 import os
+import shutil
+import subprocess
+import uuid
+
 import requests
 
+from agents.media_cache import content_key, prune_cache, touch
+from agents.shorts_builder import concat_streams, probe_duration
+from agents.shorts_transcriber import _split_sentences
 
-def build_voiceover(
-    script: str,
-    output_dir: Path,
-    voice: str = "alloy",
-    model: str = "gpt-4o-mini-tts",
-) -> Path:
-    api_key = os.environ.get("OPENAI_API_KEY", "")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY is not set")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    output_path = output_dir / "shorts_voiceover.mp3"
+
+AUDIO_SUFFIXES = {"mp3": ".mp3", "aac": ".m4a"}
+
+
+def _request_speech(
+    api_key: str, text: str, voice: str, model: str, audio_format: str = "mp3"
+) -> bytes:
     payload = {
         "model": model,
         "voice": voice,
-        "input": script,
-        "format": "mp3",
+        "input": text,
+        "response_format": audio_format,
     }
     resp = requests.post(
         "https://api.openai.com/v1/audio/speech",
@@ -28,5 +33,143 @@ def build_voiceover(
     )
     if resp.status_code >= 400:
         raise RuntimeError(f"OpenAI TTS error {resp.status_code}: {resp.text}")
-    output_path.write_bytes(resp.content)
+    return resp.content
+
+
+def _write_audio(data: bytes, dest: Path, audio_format: str) -> None:
+    # Unique temp names: two jobs may synthesize the same sentence at once.
+    token = uuid.uuid4().hex
+    tmp_path = dest.with_name(f".{dest.stem}.{token}.{audio_format}")
+    out_path = dest.with_name(f".{dest.stem}.{token}{dest.suffix}")
+    try:
+        tmp_path.write_bytes(data)
+        if audio_format == "aac":
+            # Raw ADTS has no reliable duration; remuxing into MP4 is lossless
+            # and gives exact clip lengths for the subtitle timings.
+            cmd = ["ffmpeg", "-y", "-v", "error", "-i", str(tmp_path), "-c", "copy", str(out_path)]
+            subprocess.run(cmd, check=True)
+            os.replace(out_path, dest)
+        else:
+            os.replace(tmp_path, dest)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+        out_path.unlink(missing_ok=True)
+
+
+def synthesize_sentence(
+    api_key: str,
+    text: str,
+    cache_dir: Path,
+    voice: str = "alloy",
+    model: str = "gpt-4o-mini-tts",
+    audio_format: str = "mp3",
+) -> tuple[Path, float]:
+    if audio_format not in AUDIO_SUFFIXES:
+        raise RuntimeError(f"지원하지 않는 오디오 형식입니다: {audio_format}")
+    key = content_key(text, voice, model, audio_format)
+    clip_path = cache_dir / f"{key}{AUDIO_SUFFIXES[audio_format]}"
+    meta_path = cache_dir / f"{key}.json"
+    if clip_path.exists() and meta_path.exists():
+        try:
+            duration = float(json.loads(meta_path.read_text(encoding="utf-8"))["duration"])
+            touch(clip_path)
+            touch(meta_path)
+            return clip_path, duration
+        except (KeyError, ValueError, json.JSONDecodeError):
+            pass
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _write_audio(_request_speech(api_key, text, voice, model, audio_format), clip_path, audio_format)
+    duration = probe_duration(clip_path)
+    meta = {
+        "text": text,
+        "voice": voice,
+        "model": model,
+        "format": audio_format,
+        "duration": duration,
+    }
+    tmp_meta = meta_path.with_name(f".{meta_path.stem}.{uuid.uuid4().hex}.json")
+    tmp_meta.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_meta, meta_path)
+    return clip_path, duration
+
+
+def build_voiceover_segments(
+    script: str,
+    output_dir: Path,
+    voice: str = "alloy",
+    model: str = "gpt-4o-mini-tts",
+    cache_dir: Path | None = None,
+    max_workers: int = 4,
+    cache_max_bytes: int = 200 * 1024 * 1024,
+    audio_format: str = "mp3",
+) -> tuple[Path, list[dict]]:
+    api_key = os.environ.get("OPENAI_API_KEY", "")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY is not set")
+    sentences = _split_sentences(" ".join(script.split()))
+    if not sentences:
+        raise RuntimeError("스크립트가 비어 있습니다.")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cache_dir = cache_dir or output_dir / "tts-cache"
+
+    # A repeated sentence is synthesized once and reused at each position.
+    unique = list(dict.fromkeys(sentences))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique)))) as pool:
+        clips = dict(
+            zip(
+                unique,
+                pool.map(
+                    lambda text: synthesize_sentence(
+                        api_key, text, cache_dir, voice, model, audio_format
+                    ),
+                    unique,
+                ),
+            )
+        )
+    results = [clips[text] for text in sentences]
+
+    output_path = output_dir / f"shorts_voiceover{AUDIO_SUFFIXES[audio_format]}"
+    concat_streams([clip for clip, _ in results], output_path)
+    segments: list[dict] = []
+    start = 0.0
+    for text, (_, duration) in zip(sentences, results):
+        segments.append({"start": start, "end": start + duration, "text": text})
+        start += duration
+    prune_cache(cache_dir, max_bytes=cache_max_bytes)
+    return output_path, segments
+
+
+def synthesize_script(
+    script: str,
+    output_dir: Path,
+    voice: str = "alloy",
+    model: str = "gpt-4o-mini-tts",
+    cache_dir: Path | None = None,
+    audio_format: str = "mp3",
+) -> Path:
+    # The whole script in one request, as before per-sentence synthesis.
+    # The result has no timings; the caller aligns subtitles to it. It is
+    # cached like a sentence so a retry gets byte-identical audio, which in
+    # turn hits the transcription cache.
+    api_key = os.environ.get("OPENAI_API_KEY", "")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY is not set")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cache_dir = cache_dir or output_dir / "tts-cache"
+    clip_path, _ = synthesize_sentence(api_key, script, cache_dir, voice, model, audio_format)
+    output_path = output_dir / f"shorts_voiceover{AUDIO_SUFFIXES[audio_format]}"
+    shutil.copyfile(clip_path, output_path)
+    return output_path
+
+
+def build_voiceover(
+    script: str,
+    output_dir: Path,
+    voice: str = "alloy",
+    model: str = "gpt-4o-mini-tts",
+    cache_dir: Path | None = None,
+) -> Path:
+    output_path, _ = build_voiceover_segments(
+        script, output_dir, voice=voice, model=model, cache_dir=cache_dir
+    )
     return output_path
@@ -1,20 +1,38 @@
+import atexit
 import csv
 import datetime as dt
 import json
 import os
 import re
+import shutil
+import sys
 import threading
+import time
+import uuid
 from pathlib import Path
 
 import requests
-from flask import Flask, abort, jsonify, redirect, render_template, request, session, url_for
+from flask import (
+    Flask,
+    abort,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    send_file,
+    session,
+    url_for,
+)
 
+from agents.artifact_store import DIGEST_RE, collect_references, garbage_collect, store_file
 from agents.blog_writer import build_blog_prompt
-from agents.naver_uploader import open_naver_writer
+from agents.image_pipeline import normalize_images, stream_to_disk, thumbnail_path
+from agents.naver_queue import drain_queue, enqueue_post, list_jobs, set_browser_limit
+from agents.profile_clones import clone_dirs
 from agents.shorts_agent import build_shorts_prompt
-from agents.shorts_voice_agent import build_voiceover
+from agents.shorts_voice_agent import build_voiceover_segments, synthesize_script
 from agents.shorts_image_agent import generate_images
-from agents.shorts_builder import build_short_video, build_srt_from_segments
+from agents.shorts_builder import build_short_variants, build_short_video, build_srt_from_segments
 from agents.shorts_transcriber import (
     transcribe_with_timestamps,
     merge_segments_by_sentence,
@@ -58,13 +76,65 @@ LOG_PATH = PROJECT_ROOT / "logs" / "posters-log.csv"
 THEME_MAP_PATH = PROJECT_ROOT / "logs" / "used-themes.csv"
 NEW_BADGE_PATH = PROJECT_ROOT / "logs" / "new-verses.csv"
 SETTINGS_PATH = PROJECT_ROOT / "logs" / "settings.json"
-IMAGE_DIR = PROJECT_ROOT / "logs" / "generated-images"
 BLOG_LOG_PATH = PROJECT_ROOT / "logs" / "blog-log.csv"
 BLOG_IMAGE_MAP_PATH = PROJECT_ROOT / "logs" / "blog-images.json"
+BLOG_IMAGE_JOBS_PATH = PROJECT_ROOT / "logs" / "blog-image-jobs.json"
 SHORTS_PROGRESS_PATH = PROJECT_ROOT / "logs" / "shorts" / "progress.json"
+SHORTS_JOBS_PATH = PROJECT_ROOT / "logs" / "shorts" / "jobs.json"
+NAVER_QUEUE_PATH = PROJECT_ROOT / "logs" / "naver" / "queue.json"
+SHORTS_CACHE_DIR = PROJECT_ROOT / "logs" / "shorts" / "cache"
+SHORTS_THUMBNAIL_PATH = PROJECT_ROOT / "logs" / "shorts" / "render_thumb.jpg"
+SHORTS_PARALLEL_RENDER = os.environ.get("LFL_SHORTS_PARALLEL", "1") == "1"
+SHORTS_SUBTITLE_MODE = os.environ.get("LFL_SHORTS_SUBTITLES", "burn")
+SHORTS_ASPECTS = tuple(
+    aspect.strip() for aspect in os.environ.get("LFL_SHORTS_ASPECTS", "9:16").split(",") if aspect.strip()
+)
+SHORTS_FINAL_OVERRIDES = {
+    "preset": os.environ.get("LFL_SHORTS_PRESET") or None,
+    "crf": os.environ.get("LFL_SHORTS_CRF") or None,
+    "threads": os.environ.get("LFL_SHORTS_THREADS") or None,
+}
+ARTIFACT_STORE_DIR = PROJECT_ROOT / "logs" / "store"
+ARTIFACT_STORE_MAX_BYTES = int(os.environ.get("LFL_STORE_MAX_MB", "1024")) * 1024 * 1024
+IMAGE_OUTPUT_FORMAT = os.environ.get("LFL_IMAGE_FORMAT", "jpeg")
+IMAGE_OUTPUT_COMPRESSION = int(os.environ.get("LFL_IMAGE_COMPRESSION", "85"))
+UPLOAD_MAX_BYTES = int(os.environ.get("LFL_UPLOAD_MAX_MB", "25")) * 1024 * 1024
+UPLOAD_MAX_FILES = int(os.environ.get("LFL_UPLOAD_MAX_FILES", "10"))
+
+NAVER_SESSION_MAX_USES = int(os.environ.get("LFL_NAVER_MAX_USES", "20"))
+NAVER_PREWARM = os.environ.get("LFL_NAVER_PREWARM", "1") == "1"
+NAVER_HEADLESS = os.environ.get("LFL_NAVER_HEADLESS", "0") == "1"
+NAVER_RETRIES = int(os.environ.get("LFL_NAVER_RETRIES", "2"))
+NAVER_PARALLEL = int(os.environ.get("LFL_NAVER_PARALLEL", "1"))
+NAVER_MAX_BROWSERS = int(os.environ.get("LFL_NAVER_MAX_BROWSERS", "2"))
+set_browser_limit(NAVER_MAX_BROWSERS)
+MEDIA_ROOT = PROJECT_ROOT / "logs"
+# logs/ also holds settings.json (API key, Naver password), queue state and
+# driver logs, so only image, video and audio files are served from it.
+MEDIA_EXTENSIONS = {
+    ".jpg", ".jpeg", ".png", ".webp", ".gif", ".mp4", ".mov", ".webm", ".mp3", ".wav", ".m4a",
+}
+MEDIA_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("FLASK_SECRET_KEY", "dev-secret-key")
+app.config["USE_X_SENDFILE"] = os.environ.get("LFL_X_SENDFILE", "0") == "1"
+# Rejects oversized request bodies with 413 while they stream in, before
+# Werkzeug spools them; stream_to_disk still enforces the per-file limit.
+app.config["MAX_CONTENT_LENGTH"] = UPLOAD_MAX_BYTES * UPLOAD_MAX_FILES + 1024 * 1024
+
+
+@app.errorhandler(413)
+def upload_too_large(exc):
+    session["flash_error"] = (
+        f"업로드 용량이 너무 큽니다. 파일당 {UPLOAD_MAX_BYTES // (1024 * 1024)}MB, "
+        f"한 번에 {UPLOAD_MAX_FILES}개까지 올릴 수 있습니다."
+    )
+    if request.path.startswith("/blog"):
+        session["preserve_blog_result"] = True
+    elif request.path.startswith("/shorts"):
+        session["preserve_shorts_result"] = True
+    return redirect(request.path)
 
 
 def load_settings(path: Path) -> dict:
@@ -915,9 +985,99 @@ def load_blog_images(path: Path) -> dict[str, str]:
         return {}
 
 
-def save_blog_images(path: Path, data: dict[str, str]) -> None:
+def write_json_file(path: Path, data: dict) -> None:
+    # Written to a temp file and renamed so a concurrent reader (the store
+    # garbage collector in particular) never sees a half-written file.
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def save_blog_images(path: Path, data: dict[str, str]) -> None:
+    write_json_file(path, data)
+
+
+# blog-images.json is written by uploads and by background image jobs, so
+# every read-modify-write of it (and of the job file) holds this lock.
+BLOG_IMAGE_LOCK = threading.Lock()
+BLOG_IMAGE_JOB_LIMIT = 20
+# Drafts whose image job is running in this process. The job file alone
+# cannot tell: a job cut short by a restart stays "in_progress" there.
+BLOG_IMAGE_RUNNING: set[str] = set()
+
+
+def update_blog_image_job(draft_id: str, **fields) -> dict:
+    with BLOG_IMAGE_LOCK:
+        jobs = load_blog_images(BLOG_IMAGE_JOBS_PATH)
+        job = {**jobs.get(draft_id, {}), **fields}
+        jobs[draft_id] = job
+        # Draft ids start with a timestamp, so the newest sort last.
+        save_blog_images(BLOG_IMAGE_JOBS_PATH, dict(sorted(jobs.items())[-BLOG_IMAGE_JOB_LIMIT:]))
+    return job
+
+
+def attach_blog_images(draft_id: str, paths: list[str], generated: bool = False) -> bool:
+    with BLOG_IMAGE_LOCK:
+        if generated:
+            job = load_blog_images(BLOG_IMAGE_JOBS_PATH).get(draft_id, {})
+            if job.get("status") == "superseded":
+                return False
+        blog_images = load_blog_images(BLOG_IMAGE_MAP_PATH)
+        blog_images[draft_id] = paths
+        save_blog_images(BLOG_IMAGE_MAP_PATH, blog_images)
+    return True
+
+
+def start_blog_image_job(draft_id: str, prompts: list[str]) -> None:
+    # Registered first so the status endpoint never sees an in_progress job
+    # it does not know about.
+    with BLOG_IMAGE_LOCK:
+        BLOG_IMAGE_RUNNING.add(draft_id)
+    update_blog_image_job(
+        draft_id, status="in_progress", done=0, total=len(prompts), images=[], error=""
+    )
+    start_background(run_blog_image_job, kwargs={"draft_id": draft_id, "prompts": prompts})
+
+
+def blog_images_pending(draft_id: str) -> bool:
+    # Caller holds BLOG_IMAGE_LOCK. Images uploaded by hand supersede the
+    # job, so the draft is ready even if its last request is still running.
+    if draft_id not in BLOG_IMAGE_RUNNING:
+        return False
+    job = load_blog_images(BLOG_IMAGE_JOBS_PATH).get(draft_id, {})
+    return job.get("status") == "in_progress"
+
+
+def run_blog_image_job(draft_id: str, prompts: list[str]) -> None:
+    # One request per image so the page can show each as soon as it is
+    # stored; images uploaded by hand in the meantime take precedence.
+    draft_dir = PROJECT_ROOT / "logs" / "blog-images" / draft_id
+    paths: list[str] = []
+    try:
+        for idx, prompt in enumerate(prompts, start=1):
+            generated = generate_images(
+                [prompt],
+                draft_dir,
+                size="1024x1024",
+                output_format=IMAGE_OUTPUT_FORMAT,
+                output_compression=IMAGE_OUTPUT_COMPRESSION,
+            )
+            paths.extend(str(store_file(ARTIFACT_STORE_DIR, path, move=True)) for path in generated)
+            if not attach_blog_images(draft_id, list(paths), generated=True):
+                return
+            update_blog_image_job(draft_id, done=idx, images=list(paths))
+        update_blog_image_job(draft_id, status="done")
+        collect_artifact_garbage()
+    except Exception as exc:
+        update_blog_image_job(draft_id, status="error", error=f"블로그 이미지 생성 실패: {exc}")
+    finally:
+        with BLOG_IMAGE_LOCK:
+            BLOG_IMAGE_RUNNING.discard(draft_id)
+        shutil.rmtree(draft_dir, ignore_errors=True)
 
 
 def load_shorts_progress(path: Path) -> dict:
@@ -930,8 +1090,124 @@ def load_shorts_progress(path: Path) -> dict:
 
 
 def save_shorts_progress(path: Path, data: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json_file(path, data)
+
+
+# progress.json only holds the current job and is cleared on every new
+# visit, so uploads waiting for a render and the outputs of finished jobs
+# are kept here for the store garbage collector to see.
+SHORTS_JOBS_LOCK = threading.Lock()
+SHORTS_JOBS_LIMIT = 20
+
+
+def record_shorts_artifacts(kind: str, paths: list[str]) -> None:
+    with SHORTS_JOBS_LOCK:
+        data = load_shorts_progress(SHORTS_JOBS_PATH)
+        entries = data.get(kind, [])
+        entries.append({"at": dt.datetime.now().isoformat(timespec="seconds"), "paths": paths})
+        data[kind] = entries[-SHORTS_JOBS_LIMIT:]
+        save_shorts_progress(SHORTS_JOBS_PATH, data)
+
+
+# Threads started for work that outlives its request, so a server shutdown
+# can wait for them instead of cutting a render or upload off mid-way.
+BACKGROUND_THREADS: set[threading.Thread] = set()
+BACKGROUND_LOCK = threading.Lock()
+
+
+def start_background(target, kwargs: dict | None = None) -> threading.Thread:
+    def run() -> None:
+        try:
+            target(**(kwargs or {}))
+        finally:
+            with BACKGROUND_LOCK:
+                BACKGROUND_THREADS.discard(threading.current_thread())
+
+    thread = threading.Thread(target=run, daemon=True)
+    with BACKGROUND_LOCK:
+        BACKGROUND_THREADS.add(thread)
+    thread.start()
+    return thread
+
+
+def shutdown_background_jobs(timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    drain_queue(NAVER_QUEUE_PATH, timeout)
+    with BACKGROUND_LOCK:
+        threads = list(BACKGROUND_THREADS)
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    if "agents.browser_pool" in sys.modules:
+        from agents.browser_pool import shutdown_pool
+
+        # Visible Chrome windows keep the finished posts open for review.
+        shutdown_pool(headless_only=True)
+
+
+def naver_profile_dir(settings_data: dict) -> str:
+    profile_dir = settings_data.get("chrome_profile_dir", "").strip()
+    if not profile_dir:
+        profile_dir = str(Path.home() / "Library/Application Support/LetterForLivingChrome")
+    return profile_dir
+
+
+def warm_naver_session(settings_data: dict) -> None:
+    write_url = settings_data.get("naver_write_url", "").strip()
+    if not NAVER_PREWARM or not write_url:
+        return
+
+    def run_warm() -> None:
+        # Selenium is only imported once a browser is actually needed.
+        from agents.browser_pool import warm_driver
+
+        try:
+            profile_dir = naver_profile_dir(settings_data)
+            if NAVER_PARALLEL > 1:
+                warm_driver(
+                    clone_dirs(profile_dir, NAVER_PARALLEL)[0],
+                    PROJECT_ROOT,
+                    write_url,
+                    headless=NAVER_HEADLESS,
+                    template_dir=profile_dir,
+                )
+            else:
+                warm_driver(profile_dir, PROJECT_ROOT, write_url, headless=NAVER_HEADLESS)
+        except Exception:
+            pass
+
+    start_background(run_warm)
+
+
+def save_upload_to_store(file) -> Path:
+    safe_name = re.sub(r"[^a-zA-Z0-9._-]", "_", file.filename)
+    suffix = Path(safe_name).suffix.lower() or ".bin"
+    tmp_path, digest = stream_to_disk(file.stream, ARTIFACT_STORE_DIR, suffix, UPLOAD_MAX_BYTES)
+    return store_file(ARTIFACT_STORE_DIR, tmp_path, move=True, digest=digest)
+
+
+def save_uploaded_images(files) -> list[dict]:
+    originals = [save_upload_to_store(file) for file in files]
+    return normalize_images(originals, ARTIFACT_STORE_DIR)
+
+
+def artifact_reference_files() -> list[Path]:
+    return [
+        *sorted(BRIEFS_DIR.glob("*.md")),
+        BLOG_IMAGE_MAP_PATH,
+        SHORTS_PROGRESS_PATH,
+        SHORTS_JOBS_PATH,
+    ]
+
+
+def collect_artifact_garbage() -> None:
+    # A reference file that cannot be read skips this pass rather than
+    # counting as "no references", which would free blobs still in use.
+    try:
+        with BLOG_IMAGE_LOCK:
+            referenced = collect_references(artifact_reference_files())
+        garbage_collect(ARTIFACT_STORE_DIR, referenced, ARTIFACT_STORE_MAX_BYTES)
+    except (OSError, ValueError):
+        pass
 
 
 def load_used_theme_map(log_path: Path) -> dict[str, str]:
@@ -1424,6 +1700,8 @@ def settings():
             settings_data["naver_password"] = request.form.get("naver_password", "").strip()
             settings_data["naver_write_url"] = request.form.get("naver_write_url", "").strip()
             settings_data["chrome_profile_dir"] = request.form.get("chrome_profile_dir", "").strip()
+            typing_mode = request.form.get("naver_typing_mode", "paste").strip()
+            settings_data["naver_typing_mode"] = typing_mode if typing_mode in ("paste", "human") else "paste"
         settings_data["openai_api_key"] = request.form.get("openai_api_key", "").strip()
         save_settings(SETTINGS_PATH, settings_data)
         if settings_data.get("openai_api_key"):
@@ -1448,6 +1726,59 @@ def brief():
     return render_template("brief.html", content=content, file=str(rel))
 
 
+@app.template_filter("media_url")
+def media_url(path: str | Path) -> str:
+    try:
+        rel = Path(path).resolve().relative_to(MEDIA_ROOT.resolve())
+    except (TypeError, ValueError):
+        return ""
+    if not is_media_file(rel):
+        return ""
+    return url_for("media", rel=rel.as_posix())
+
+
+@app.template_filter("thumbnail_url")
+def thumbnail_url(path: str | Path) -> str:
+    # Uploaded masters have a small derivative next to them; anything
+    # else (generated images) is shown as-is.
+    thumb = thumbnail_path(ARTIFACT_STORE_DIR, Path(path))
+    return media_url(thumb if thumb.exists() else path)
+
+
+def is_media_file(rel: Path) -> bool:
+    # Hidden names cover in-progress temp files and dot-directories.
+    if any(part.startswith(".") for part in rel.parts):
+        return False
+    return rel.suffix.lower() in MEDIA_EXTENSIONS
+
+
+@app.route("/media/<path:rel>")
+def media(rel: str):
+    root = MEDIA_ROOT.resolve()
+    target = (root / rel).resolve()
+    try:
+        resolved_rel = target.relative_to(root)
+    except ValueError:
+        abort(404)
+    if not is_media_file(resolved_rel) or not target.is_file():
+        abort(404)
+    # Store blobs are named after their content digest, so the name is a
+    # strong validator and the response never changes for that URL.
+    hashed = DIGEST_RE.match(target.name) is not None
+    response = send_file(
+        target,
+        conditional=True,
+        etag=target.name if hashed else True,
+        max_age=MEDIA_IMMUTABLE_MAX_AGE if hashed else 0,
+    )
+    if hashed:
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+
 @app.route("/shorts", methods=["GET", "POST"])
 def shorts():
     if request.method == "GET" and not session.pop("preserve_shorts_result", False):
@@ -1556,16 +1887,19 @@ def shorts():
             if not files:
                 session["flash_error"] = "이미지 파일을 선택해 주세요."
                 return redirect(url_for("shorts"))
-            output_dir = PROJECT_ROOT / "logs" / "shorts" / "uploads"
-            output_dir.mkdir(parents=True, exist_ok=True)
-            saved_paths: list[str] = []
-            for file in files:
-                safe_name = re.sub(r"[^a-zA-Z0-9._-]", "_", file.filename)
-                timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
-                dest = output_dir / f"{timestamp}_{safe_name}"
-                file.save(dest)
-                saved_paths.append(str(dest))
-            session["shorts_uploaded_images"] = saved_paths
+            if len(files) > UPLOAD_MAX_FILES:
+                session["preserve_shorts_result"] = True
+                session["flash_error"] = f"이미지는 한 번에 {UPLOAD_MAX_FILES}개까지 올릴 수 있습니다."
+                return redirect(url_for("shorts"))
+            try:
+                saved_images = save_uploaded_images(files)
+            except RuntimeError as exc:
+                session["preserve_shorts_result"] = True
+                session["flash_error"] = str(exc)
+                return redirect(url_for("shorts"))
+            session["shorts_uploaded_images"] = [item["master"] for item in saved_images]
+            record_shorts_artifacts("uploads", session["shorts_uploaded_images"])
+            collect_artifact_garbage()
             session["preserve_shorts_result"] = True
             session["flash_notice"] = "이미지를 업로드했습니다."
             return redirect(url_for("shorts"))
@@ -1573,7 +1907,14 @@ def shorts():
             if not shorts_result:
                 session["flash_error"] = "먼저 초안을 생성해 주세요."
                 return redirect(url_for("shorts"))
+            if progress.get("status") == "in_progress" and not progress.get("outputs"):
+                session["preserve_shorts_result"] = True
+                session["flash_error"] = "이미 숏츠를 제작 중입니다."
+                return redirect(url_for("shorts"))
             voice = request.form.get("voice", "alloy").strip() or "alloy"
+            render_profile = request.form.get("render_profile", "final").strip()
+            if render_profile not in ("preview", "final"):
+                render_profile = "final"
             raw_length = session.get("shorts_length_seconds", "60초")
             try:
                 total_seconds = float(re.sub(r"[^0-9.]", "", str(raw_length)) or 60)
@@ -1594,14 +1935,41 @@ def shorts():
                     steps = progress_data.get("steps", [])
                     steps.append("나레이션 생성 중...")
                     save_shorts_progress(SHORTS_PROGRESS_PATH, {**progress_data, "steps": steps})
-                    voice_path = build_voiceover(script_text, output_dir, voice=payload["voice"])
+                    try:
+                        voice_path, merged_segments = build_voiceover_segments(
+                            script_text,
+                            output_dir,
+                            voice=payload["voice"],
+                            cache_dir=SHORTS_CACHE_DIR / "tts",
+                            audio_format="aac",
+                        )
+                    except Exception:
+                        # A sentence the TTS rejects or clips that will not
+                        # concatenate fall back to one request for the whole
+                        # script, timed by alignment below.
+                        voice_path = synthesize_script(
+                            script_text,
+                            output_dir,
+                            voice=payload["voice"],
+                            cache_dir=SHORTS_CACHE_DIR / "tts",
+                            audio_format="aac",
+                        )
+                        merged_segments = []
                     progress_data = load_shorts_progress(SHORTS_PROGRESS_PATH)
                     steps = progress_data.get("steps", [])
                     steps.append("자막 타임코드 생성 중...")
                     save_shorts_progress(SHORTS_PROGRESS_PATH, {**progress_data, "steps": steps})
-                    segments = transcribe_with_timestamps(voice_path)
-                    merged_segments = merge_segments_by_sentence(segments)
-                    merged_segments = split_long_segments(merged_segments)
+                    if not merged_segments:
+                        from agents.shorts_aligner import align_script_to_audio
+
+                        try:
+                            merged_segments = align_script_to_audio(voice_path, script_text)
+                        except Exception:
+                            segments = transcribe_with_timestamps(
+                                voice_path, cache_dir=SHORTS_CACHE_DIR / "stt"
+                            )
+                            merged_segments = merge_segments_by_sentence(segments)
+                            merged_segments = split_long_segments(merged_segments)
                     srt_path = output_dir / "shorts_video.srt"
                     build_srt_from_segments(merged_segments, srt_path)
                     progress_data = load_shorts_progress(SHORTS_PROGRESS_PATH)
@@ -1615,37 +1983,93 @@ def shorts():
                         if not isinstance(image_prompts, list) or not image_prompts:
                             raise RuntimeError("이미지 프롬프트가 없습니다.")
                         images_dir = output_dir / "images"
-                        image_paths = generate_images(image_prompts, images_dir)
+                        image_paths = [
+                            store_file(ARTIFACT_STORE_DIR, path, move=True)
+                            for path in generate_images(
+                                image_prompts,
+                                images_dir,
+                                output_format=IMAGE_OUTPUT_FORMAT,
+                                output_compression=IMAGE_OUTPUT_COMPRESSION,
+                            )
+                        ]
                     progress_data = load_shorts_progress(SHORTS_PROGRESS_PATH)
                     steps = progress_data.get("steps", [])
                     steps.append("영상 합성 중...")
                     save_shorts_progress(SHORTS_PROGRESS_PATH, {**progress_data, "steps": steps})
-                    video_path = output_dir / "shorts_video.mp4"
-                    build_short_video(
-                        image_paths=image_paths,
-                        audio_path=voice_path,
-                        script=script_text,
-                        title=shorts_result.get("title", ""),
-                        output_path=video_path,
-                        total_seconds=payload["total_seconds"],
-                        srt_path=srt_path,
-                    )
+                    preview = payload["render_profile"] == "preview"
+                    video_name = "shorts_preview.mp4" if preview else "shorts_video.mp4"
+                    video_path = output_dir / video_name
+                    SHORTS_THUMBNAIL_PATH.unlink(missing_ok=True)
+
+                    def report_render(render: dict) -> None:
+                        if SHORTS_THUMBNAIL_PATH.exists():
+                            stamp = SHORTS_THUMBNAIL_PATH.stat().st_mtime_ns
+                            render["thumbnail"] = f"/shorts/thumbnail?v={stamp}"
+                        progress_data = load_shorts_progress(SHORTS_PROGRESS_PATH)
+                        save_shorts_progress(
+                            SHORTS_PROGRESS_PATH, {**progress_data, "render": render}
+                        )
+
+                    if preview or SHORTS_ASPECTS == ("9:16",):
+                        build_short_video(
+                            image_paths=image_paths,
+                            audio_path=voice_path,
+                            script=script_text,
+                            title=shorts_result.get("title", ""),
+                            output_path=video_path,
+                            total_seconds=payload["total_seconds"],
+                            srt_path=srt_path,
+                            parallel=SHORTS_PARALLEL_RENDER,
+                            profile=payload["render_profile"],
+                            profile_overrides=None if preview else SHORTS_FINAL_OVERRIDES,
+                            cache_dir=SHORTS_CACHE_DIR / "render",
+                            subtitle_mode=SHORTS_SUBTITLE_MODE,
+                            on_progress=report_render,
+                            thumbnail_path=SHORTS_THUMBNAIL_PATH,
+                        )
+                        video_label = "미리보기 영상" if preview else "숏츠 영상"
+                        videos = [(video_label, video_path)]
+                    else:
+                        variants = build_short_variants(
+                            image_paths=image_paths,
+                            audio_path=voice_path,
+                            script=script_text,
+                            title=shorts_result.get("title", ""),
+                            output_path=video_path,
+                            aspects=SHORTS_ASPECTS,
+                            total_seconds=payload["total_seconds"],
+                            srt_path=srt_path,
+                            profile_overrides=SHORTS_FINAL_OVERRIDES,
+                            cache_dir=SHORTS_CACHE_DIR / "render",
+                            subtitle_mode=SHORTS_SUBTITLE_MODE,
+                            on_progress=report_render,
+                        )
+                        videos = [(f"숏츠 영상 ({aspect})", path) for aspect, path in variants.items()]
+                    voice_path = store_file(ARTIFACT_STORE_DIR, voice_path)
+                    if not preview:
+                        videos = [
+                            (label, store_file(ARTIFACT_STORE_DIR, path, move=True))
+                            for label, path in videos
+                        ]
                     outputs = [{"label": "나레이션 오디오", "path": str(voice_path)}]
                     for idx, path in enumerate(image_paths, start=1):
                         outputs.append({"label": f"컷 이미지 {idx}", "path": str(path)})
-                    outputs.append({"label": "숏츠 영상", "path": str(video_path)})
+                    for label, path in videos:
+                        outputs.append({"label": label, "path": str(path)})
                     save_shorts_progress(
                         SHORTS_PROGRESS_PATH,
                         {"status": "done", "steps": steps + ["완료"], "outputs": outputs},
                     )
+                    record_shorts_artifacts("outputs", [item["path"] for item in outputs])
+                    collect_artifact_garbage()
                 except Exception as exc:
                     save_shorts_progress(
                         SHORTS_PROGRESS_PATH,
                         {"status": "error", "steps": [str(exc)], "outputs": []},
                     )
 
-            thread = threading.Thread(
-                target=run_shorts_job,
+            start_background(
+                run_shorts_job,
                 kwargs={
                     "payload": {
                         "script": shorts_result.get("script", ""),
@@ -1653,11 +2077,10 @@ def shorts():
                         "image_prompts": shorts_result.get("image_prompts", []),
                         "voice": voice,
                         "total_seconds": total_seconds,
+                        "render_profile": render_profile,
                     }
                 },
-                daemon=True,
             )
-            thread.start()
             session["preserve_shorts_result"] = True
             session["flash_notice"] = "숏츠 제작을 시작했습니다."
             return redirect(url_for("shorts"))
@@ -1680,7 +2103,7 @@ def shorts():
 def shorts_status():
     progress = load_shorts_progress(SHORTS_PROGRESS_PATH)
     if not progress:
-        return jsonify({"status": "idle", "steps": [], "outputs": []})
+        return jsonify({"status": "idle", "steps": [], "outputs": [], "render": None})
     status = progress.get("status", "idle")
     outputs = progress.get("outputs", [])
     steps = progress.get("steps", [])
@@ -1688,7 +2111,52 @@ def shorts_status():
         status = "done"
         if not steps or steps[-1] != "완료":
             steps = steps + ["완료"]
-    return jsonify({"status": status, "steps": steps, "outputs": outputs})
+    render = progress.get("render") if status == "in_progress" else None
+    outputs = [{**item, "url": media_url(item.get("path", ""))} for item in outputs]
+    return jsonify({"status": status, "steps": steps, "outputs": outputs, "render": render})
+
+
+@app.route("/shorts/thumbnail", methods=["GET"])
+def shorts_thumbnail():
+    if not SHORTS_THUMBNAIL_PATH.exists():
+        abort(404)
+    return send_file(SHORTS_THUMBNAIL_PATH, mimetype="image/jpeg", max_age=0)
+
+
+@app.route("/naver/queue", methods=["GET"])
+def naver_queue_status():
+    return jsonify({"jobs": list_jobs(NAVER_QUEUE_PATH)})
+
+
+@app.route("/blog/images/status", methods=["GET"])
+def blog_images_status():
+    draft_id = request.args.get("draft_id") or session.get("current_draft_id")
+    if not draft_id:
+        return jsonify({"status": "idle", "images": []})
+    with BLOG_IMAGE_LOCK:
+        job = load_blog_images(BLOG_IMAGE_JOBS_PATH).get(str(draft_id), {})
+        paths = load_blog_images(BLOG_IMAGE_MAP_PATH).get(str(draft_id)) or []
+        if job.get("status") == "in_progress" and str(draft_id) not in BLOG_IMAGE_RUNNING:
+            # The job died with an earlier server process.
+            job = {
+                **job,
+                "status": "error",
+                "error": "앱이 다시 시작되어 이미지 생성이 중단되었습니다. 초안을 다시 생성하거나 이미지를 업로드해 주세요.",
+            }
+    if isinstance(paths, str):
+        paths = [paths]
+    images = [
+        {"path": path, "url": media_url(path), "thumbnail": thumbnail_url(path)} for path in paths
+    ]
+    return jsonify(
+        {
+            "status": job.get("status", "done" if paths else "idle"),
+            "done": job.get("done", 0),
+            "total": job.get("total", 0),
+            "error": job.get("error", ""),
+            "images": images,
+        }
+    )
 
 
 @app.route("/blog", methods=["GET", "POST"])
@@ -1716,7 +2184,8 @@ def blog():
     }
     used_entries = build_used_entries(sorted(used), used_theme_map, themes)
     blog_history = load_blog_history()
-    blog_images = load_blog_images(BLOG_IMAGE_MAP_PATH)
+    with BLOG_IMAGE_LOCK:
+        blog_images = load_blog_images(BLOG_IMAGE_MAP_PATH)
     if draft_id:
         image_paths = blog_images.get(str(draft_id))
     else:
@@ -1737,16 +2206,16 @@ def blog():
                 if not draft_id:
                     session["flash_error"] = "먼저 초안을 생성해 주세요."
                     return redirect(url_for("blog"))
-                IMAGE_DIR.mkdir(parents=True, exist_ok=True)
-                saved_paths: list[str] = []
-                for file in files[:2]:
-                    safe_name = re.sub(r"[^a-zA-Z0-9._-]", "_", file.filename)
-                    timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
-                    dest = IMAGE_DIR / f"{timestamp}_{safe_name}"
-                    file.save(dest)
-                    saved_paths.append(str(dest))
-                blog_images[str(draft_id)] = saved_paths
-                save_blog_images(BLOG_IMAGE_MAP_PATH, blog_images)
+                try:
+                    saved_images = save_uploaded_images(files[:2])
+                except RuntimeError as exc:
+                    session["preserve_blog_result"] = True
+                    session["flash_error"] = str(exc)
+                    return redirect(url_for("blog"))
+                saved_paths = [item["master"] for item in saved_images]
+                update_blog_image_job(str(draft_id), status="superseded")
+                attach_blog_images(str(draft_id), saved_paths)
+                collect_artifact_garbage()
                 session["last_image_paths"] = saved_paths
                 session["preserve_blog_result"] = True
                 session["flash_notice"] = "이미지를 업로드했습니다."
@@ -1800,21 +2269,26 @@ def blog():
                     body = blog_result.get("body", "")
                     hashtags = blog_result.get("hashtags", "")
                     full_body = body + ("\n\n" + hashtags if hashtags else "")
+                    if draft_id:
+                        with BLOG_IMAGE_LOCK:
+                            pending = blog_images_pending(str(draft_id))
+                            image_paths = load_blog_images(BLOG_IMAGE_MAP_PATH).get(str(draft_id))
+                        if pending:
+                            # Queueing now would publish the post without
+                            # the images that are still being generated.
+                            session["preserve_blog_result"] = True
+                            session["flash_error"] = "이미지를 생성하는 중입니다. 이미지가 준비된 뒤 다시 등록해 주세요."
+                            return redirect(url_for("blog"))
                     try:
-                        profile_dir = settings_data.get("chrome_profile_dir", "").strip()
-                        if not profile_dir:
-                            profile_dir = str(Path.home() / "Library/Application Support/LetterForLivingChrome")
-                        if draft_id:
-                            image_paths = blog_images.get(str(draft_id))
-                        else:
+                        profile_dir = naver_profile_dir(settings_data)
+                        if not draft_id:
                             image_paths = session.get("last_image_paths")
                         if isinstance(image_paths, str):
                             image_paths = [image_paths]
                         if not isinstance(image_paths, list):
                             image_paths = []
-                        thread = threading.Thread(
-                            target=open_naver_writer,
-                            kwargs={
+                        enqueue_post(
+                            {
                                 "write_url": write_url,
                                 "naver_id": settings_data.get("naver_id", ""),
                                 "naver_password": settings_data.get("naver_password", ""),
@@ -1823,12 +2297,17 @@ def blog():
                                 "profile_dir": profile_dir,
                                 "project_root": PROJECT_ROOT,
                                 "image_paths": image_paths,
+                                "max_uses": NAVER_SESSION_MAX_USES,
+                                "typing_mode": settings_data.get("naver_typing_mode", "paste"),
+                                "headless": NAVER_HEADLESS,
+                                "draft_id": draft_id,
                             },
-                            daemon=True,
+                            NAVER_QUEUE_PATH,
+                            retries=NAVER_RETRIES,
+                            workers=NAVER_PARALLEL,
                         )
-                        thread.start()
                         session["preserve_blog_result"] = True
-                        session["flash_notice"] = "브라우저를 열었습니다. 로그인 후 자동 입력이 진행됩니다."
+                        session["flash_notice"] = "업로드 대기열에 추가했습니다. 진행 상황은 아래에서 확인할 수 있습니다."
                         return redirect(url_for("blog"))
                     except Exception as exc:
                         session["flash_error"] = str(exc)
@@ -1908,17 +2387,10 @@ def blog():
                         },
                     ]
                     session["last_image_prompt"] = image_prompt
-                    try:
-                        prompts = [item["text"] for item in image_prompt]
-                        images_dir = PROJECT_ROOT / "logs" / "blog-images"
-                        generated_paths = generate_images(prompts, images_dir, size="1024x1024")
-                        if draft_id:
-                            blog_images[str(draft_id)] = [str(path) for path in generated_paths]
-                            save_blog_images(BLOG_IMAGE_MAP_PATH, blog_images)
-                            session["last_image_paths"] = [str(path) for path in generated_paths]
-                    except Exception as exc:
-                        session["flash_error"] = f"블로그 이미지 생성 실패: {exc}"
-                    session["flash_notice"] = "초안을 생성했습니다."
+                    prompts = [item["text"] for item in image_prompt]
+                    start_blog_image_job(draft_id, prompts)
+                    warm_naver_session(settings_data)
+                    session["flash_notice"] = "초안을 생성했습니다. 이미지는 준비되는 대로 표시됩니다."
                     return redirect(url_for("blog"))
                 except Exception as exc:
                     session["flash_error"] = str(exc)
@@ -1939,5 +2411,8 @@ def blog():
 
 
 if __name__ == "__main__":
+    # Development server; production runs under gunicorn (see gunicorn.conf.py).
     port = int(os.environ.get("PORT", "5050"))
-    app.run(debug=True, port=port)
+    debug = os.environ.get("LFL_DEBUG", "0") == "1"
+    atexit.register(shutdown_background_jobs)
+    app.run(debug=debug, port=port, threaded=True)
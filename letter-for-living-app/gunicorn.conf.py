@@ -0,0 +1,52 @@
+# Production server: gunicorn -c gunicorn.conf.py app:app
+import os
+import signal
+import time
+
+bind = f"{os.environ.get('HOST', '127.0.0.1')}:{os.environ.get('PORT', '5050')}"
+
+# The Naver upload queue, the warm Chrome sessions and the shorts progress
+# all live in the serving process, so the default is one worker whose
+# threads handle the concurrent requests. More workers only make sense
+# when those features are not used.
+workers = int(os.environ.get("LFL_WORKERS", "1"))
+worker_class = "gthread"
+threads = int(os.environ.get("LFL_THREADS", "8"))
+
+# Draft generation and the shorts actions wait on OpenAI for minutes.
+timeout = int(os.environ.get("LFL_TIMEOUT", "300"))
+graceful_timeout = int(os.environ.get("LFL_GRACEFUL_TIMEOUT", "120"))
+keepalive = 5
+
+# Import the app (and its agents) once in the master before forking.
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+
+
+# Seconds kept back from gunicorn's kill deadline when draining uploads.
+SHUTDOWN_MARGIN = 5
+
+
+def post_worker_init(worker):
+    # gthread spends part of graceful_timeout finishing requests before
+    # worker_exit runs, so note when the stop signal arrived.
+    handle_exit = worker.handle_exit
+
+    def record_exit(sig, frame):
+        worker.exit_started = time.monotonic()
+        handle_exit(sig, frame)
+
+    signal.signal(signal.SIGTERM, record_exit)
+    signal.siginterrupt(signal.SIGTERM, False)
+
+
+def worker_exit(server, worker):
+    # Finish the post being typed and any running render with whatever is
+    # left before the master kills the worker at graceful_timeout.
+    from app import shutdown_background_jobs
+
+    started = getattr(worker, "exit_started", time.monotonic())
+    left = graceful_timeout - (time.monotonic() - started) - SHUTDOWN_MARGIN
+    shutdown_background_jobs(timeout=max(1, left))
@@ -0,0 +1,283 @@
+import argparse
+import asyncio
+import datetime as dt
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(APP_DIR))
+
+from agents.shorts_agent import build_shorts_prompt  # noqa: E402
+from agents.shorts_aligner import align_script_to_audio  # noqa: E402
+from agents.shorts_builder import build_short_video, build_srt_from_segments  # noqa: E402
+from agents.shorts_image_agent import generate_images  # noqa: E402
+from agents.shorts_voice_agent import build_voiceover_segments, synthesize_script  # noqa: E402
+from app import (  # noqa: E402
+    LOG_PATH,
+    PROJECT_ROOT,
+    SHORTS_CACHE_DIR,
+    SHORTS_FINAL_OVERRIDES,
+    SHORTS_SUBTITLE_MODE,
+    THEME_MAP_PATH,
+    call_openai,
+    load_brief_links,
+    load_theme_overrides,
+    load_used_theme_map,
+    normalize_ref,
+    parse_brief_file,
+    parse_theme,
+)
+
+SHORTS_SYSTEM_PROMPT = (
+    "You are a short-form video producer. "
+    "Return only strict JSON with no extra commentary."
+)
+
+
+def load_theme_map() -> dict[str, str]:
+    theme_map = load_used_theme_map(LOG_PATH)
+    theme_map.update(load_theme_overrides(THEME_MAP_PATH))
+    return theme_map
+
+
+def theme_matches(query: str, theme: str) -> bool:
+    query = query.strip().lower()
+    theme_en, theme_ko = parse_theme(theme)
+    return query in (theme.strip().lower(), theme_en.lower(), theme_ko.lower())
+
+
+def select_verses(args: argparse.Namespace, theme_map: dict[str, str]) -> list[str]:
+    verses = list(args.verses or [])
+    if args.verses_file:
+        lines = Path(args.verses_file).read_text(encoding="utf-8").splitlines()
+        verses.extend(line for line in lines if line.strip() and not line.startswith("#"))
+    if args.theme:
+        verses.extend(
+            verse for verse, theme in sorted(theme_map.items()) if theme_matches(args.theme, theme)
+        )
+    selected: list[str] = []
+    for verse in verses:
+        verse = normalize_ref(verse)
+        if verse and verse not in selected:
+            selected.append(verse)
+    return selected[: args.limit] if args.limit else selected
+
+
+def build_result(verse: str, theme_map: dict[str, str], brief_links: dict[str, str]) -> dict:
+    # Same shape as the /shorts "shorts_load_verse" result; a saved brief
+    # fills in the verse text when one exists.
+    theme_en, theme_ko = parse_theme(theme_map.get(verse, "미분류"))
+    result = {
+        "theme_en": theme_en,
+        "theme_ko": theme_ko,
+        "verse_reference": verse,
+        "verse_reference_en": "",
+        "english_verse": "",
+        "korean_verse": "",
+        "anchor_text": "",
+        "one_line_intent": "",
+    }
+    if verse in brief_links:
+        result.update(parse_brief_file(PROJECT_ROOT / brief_links[verse]))
+    return result
+
+
+def verse_slug(verse: str) -> str:
+    return re.sub(r"[^0-9A-Za-z가-힣]+", "_", verse).strip("_") or "verse"
+
+
+def render_verse(job: dict) -> dict:
+    # Runs in a worker process: subtitle timing and ffmpeg only, no API calls.
+    started = time.perf_counter()
+    work_dir = Path(job["work_dir"])
+    segments = job["segments"]
+    if not segments:
+        segments = align_script_to_audio(Path(job["voice_path"]), job["script"])
+    srt_path = build_srt_from_segments(segments, work_dir / "shorts_video.srt")
+    video_path = build_short_video(
+        image_paths=[Path(path) for path in job["image_paths"]],
+        audio_path=Path(job["voice_path"]),
+        script=job["script"],
+        title=job["title"],
+        output_path=work_dir / "shorts_video.mp4",
+        total_seconds=job["total_seconds"],
+        srt_path=srt_path,
+        profile=job["profile"],
+        profile_overrides=job["profile_overrides"],
+        cache_dir=SHORTS_CACHE_DIR / "render",
+        subtitle_mode=SHORTS_SUBTITLE_MODE,
+    )
+    return {
+        "video": str(video_path),
+        "srt": str(srt_path),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def synthesize_voice(script: str, work_dir: Path, voice: str) -> tuple[Path, list[dict]]:
+    # One sentence at a time so a verse holds exactly one API slot. If a
+    # sentence is rejected, the whole script goes in one request and
+    # render_verse aligns the subtitles, as the app does.
+    cache_dir = SHORTS_CACHE_DIR / "tts"
+    try:
+        return build_voiceover_segments(
+            script, work_dir, voice=voice, cache_dir=cache_dir, max_workers=1, audio_format="aac"
+        )
+    except Exception:
+        return synthesize_script(script, work_dir, voice=voice, cache_dir=cache_dir, audio_format="aac"), []
+
+
+async def timed(timings: dict, stage: str, semaphore: asyncio.Semaphore | None, func, *args, **kwargs):
+    started = time.perf_counter()
+    if semaphore is None:
+        value = await func(*args, **kwargs)
+    else:
+        async with semaphore:
+            value = await asyncio.to_thread(func, *args, **kwargs)
+    timings[stage] = round(time.perf_counter() - started, 2)
+    return value
+
+
+async def produce_verse(
+    verse: str,
+    result: dict,
+    args: argparse.Namespace,
+    batch_dir: Path,
+    api_limit: asyncio.Semaphore,
+    render_pool: ProcessPoolExecutor,
+    profile_overrides: dict | None,
+) -> dict:
+    entry: dict = {"verse": verse, "status": "in_progress", "timings": {}, "outputs": {}}
+    timings = entry["timings"]
+    started = time.perf_counter()
+    work_dir = batch_dir / verse_slug(verse)
+    try:
+        prompt = build_shorts_prompt(result, "", f"{args.length:g}초", args.cuts, args.extra_prompt)
+        shorts_result = await timed(
+            timings, "script", api_limit, call_openai, prompt, system_prompt=SHORTS_SYSTEM_PROMPT
+        )
+        script_text = (shorts_result.get("script") or "").strip()
+        image_prompts = shorts_result.get("image_prompts") or []
+        if not script_text:
+            raise RuntimeError("스크립트가 비어 있습니다.")
+        if not isinstance(image_prompts, list) or not image_prompts:
+            raise RuntimeError("이미지 프롬프트가 없습니다.")
+        entry["title"] = shorts_result.get("title", "")
+        (voice_path, segments), image_paths = await asyncio.gather(
+            timed(timings, "voice", api_limit, synthesize_voice, script_text, work_dir, args.voice),
+            timed(timings, "images", api_limit, generate_images, image_prompts, work_dir / "images"),
+        )
+        job = {
+            "work_dir": str(work_dir),
+            "script": script_text,
+            "title": entry["title"],
+            "voice_path": str(voice_path),
+            "segments": segments,
+            "image_paths": [str(path) for path in image_paths],
+            "total_seconds": args.length,
+            "profile": args.profile,
+            "profile_overrides": profile_overrides,
+        }
+        loop = asyncio.get_running_loop()
+        rendered = await timed(
+            timings, "render", None, loop.run_in_executor, render_pool, render_verse, job
+        )
+        entry["outputs"] = {
+            "voice": str(voice_path),
+            "images": job["image_paths"],
+            "srt": rendered["srt"],
+            "video": rendered["video"],
+        }
+        entry["status"] = "done"
+    except Exception as exc:
+        entry["status"] = "error"
+        entry["error"] = str(exc)
+    timings["total"] = round(time.perf_counter() - started, 2)
+    print(f"{entry['status']:<6} {verse}  {json.dumps(timings, ensure_ascii=False)}")
+    return entry
+
+
+def write_manifest(path: Path, manifest: dict) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+async def run_batch(args: argparse.Namespace, verses: list[str], batch_dir: Path) -> dict:
+    theme_map = load_theme_map()
+    brief_links = load_brief_links(LOG_PATH, PROJECT_ROOT)
+    cores = os.cpu_count() or 1
+    render_workers = max(1, min(args.render_workers or cores, len(verses)))
+    profile_overrides = None if args.profile == "preview" else dict(SHORTS_FINAL_OVERRIDES)
+    if not (profile_overrides or {}).get("threads"):
+        # One encoder thread share per worker keeps the pool from
+        # oversubscribing the cores.
+        profile_overrides = {**(profile_overrides or {}), "threads": max(1, cores // render_workers)}
+    manifest = {
+        "created_at": dt.datetime.now().isoformat(timespec="seconds"),
+        "profile": args.profile,
+        "api_concurrency": args.api_concurrency,
+        "render_workers": render_workers,
+        "verses": [],
+    }
+    manifest_path = batch_dir / "manifest.json"
+    started = time.perf_counter()
+    api_limit = asyncio.Semaphore(max(1, args.api_concurrency))
+    with ProcessPoolExecutor(max_workers=render_workers) as render_pool:
+        tasks = [
+            produce_verse(
+                verse,
+                build_result(verse, theme_map, brief_links),
+                args,
+                batch_dir,
+                api_limit,
+                render_pool,
+                profile_overrides,
+            )
+            for verse in verses
+        ]
+        for finished in asyncio.as_completed(tasks):
+            manifest["verses"].append(await finished)
+            write_manifest(manifest_path, manifest)
+    manifest["verses"].sort(key=lambda entry: verses.index(entry["verse"]))
+    manifest["total_seconds"] = round(time.perf_counter() - started, 2)
+    write_manifest(manifest_path, manifest)
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render shorts for many verses in one batch.")
+    parser.add_argument("verses", nargs="*", help="말씀 구절 (예: 요한복음 3:16)")
+    parser.add_argument("--verses-file", help="한 줄에 하나씩 구절이 적힌 파일")
+    parser.add_argument("--theme", help="used-themes.csv 의 테마와 일치하는 구절을 모두 선택합니다.")
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--length", type=float, default=25.0, help="영상 길이(초)")
+    parser.add_argument("--cuts", type=int, default=4)
+    parser.add_argument("--voice", default="alloy")
+    parser.add_argument("--extra-prompt", default="")
+    parser.add_argument("--profile", choices=("preview", "final"), default="final")
+    parser.add_argument("--api-concurrency", type=int, default=4, help="동시 LLM/TTS/이미지 요청 수")
+    parser.add_argument("--render-workers", type=int, default=0, help="ffmpeg 프로세스 수 (기본: 코어 수)")
+    parser.add_argument("--output-dir", default="", help="기본: logs/shorts/batch/<시각>")
+    args = parser.parse_args()
+    args.cuts = max(3, min(5, args.cuts))
+
+    verses = select_verses(args, load_theme_map())
+    if not verses:
+        parser.error("선택된 구절이 없습니다.")
+    stamp = dt.datetime.now().strftime("%Y%m%d-%H%M%S")
+    batch_dir = Path(args.output_dir) if args.output_dir else PROJECT_ROOT / "logs" / "shorts" / "batch" / stamp
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    print(f"{len(verses)}개 구절 → {batch_dir}")
+    manifest = asyncio.run(run_batch(args, verses, batch_dir))
+    done = sum(1 for entry in manifest["verses"] if entry["status"] == "done")
+    print(f"완료 {done}/{len(verses)}  {manifest['total_seconds']:.1f}s  {batch_dir / 'manifest.json'}")
+
+
+if __name__ == "__main__":
+    main()
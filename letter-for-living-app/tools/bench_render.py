@@ -0,0 +1,96 @@
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(APP_DIR))
+
+from agents.shorts_builder import FPS, build_short_video, build_srt  # noqa: E402
+
+
+def make_inputs(work_dir: Path, cuts: int, seconds: float) -> tuple[list[Path], Path, Path]:
+    images = []
+    for idx in range(cuts):
+        path = work_dir / f"cut_{idx + 1}.jpg"
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-y",
+                "-v",
+                "error",
+                "-f",
+                "lavfi",
+                "-i",
+                f"testsrc2=s=3024x4032:r=1,hue=h={idx * 60}",
+                "-frames:v",
+                "1",
+                str(path),
+            ],
+            check=True,
+        )
+        images.append(path)
+    audio = work_dir / "narration.mp3"
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=f=220:d={seconds}",
+            str(audio),
+        ],
+        check=True,
+    )
+    srt = work_dir / "bench.srt"
+    build_srt(["첫 번째 자막입니다.", "두 번째 자막입니다.", "세 번째 자막입니다."], seconds, srt)
+    return images, audio, srt
+
+
+def run_once(label: str, images: list[Path], audio: Path, srt: Path, seconds: float, title: str, **kwargs) -> float:
+    output = audio.parent / f"{label}.mp4"
+    started = time.perf_counter()
+    build_short_video(
+        image_paths=images,
+        audio_path=audio,
+        script="",
+        title=title,
+        output_path=output,
+        total_seconds=seconds,
+        srt_path=srt,
+        **kwargs,
+    )
+    elapsed = time.perf_counter() - started
+    fps = (seconds * FPS) / elapsed
+    print(f"{label:<12} {elapsed:7.2f}s  {fps:7.1f} fps")
+    return fps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare shorts render throughput.")
+    parser.add_argument("--cuts", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--parallel", action="store_true", help="컷 단위 병렬 렌더도 측정합니다.")
+    parser.add_argument("--title", default="Benchmark", help="빈 값이면 drawtext를 건너뜁니다.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        images, audio, srt = make_inputs(work_dir, args.cuts, args.seconds)
+        before = run_once("legacy", images, audio, srt, args.seconds, args.title, optimized=False)
+        after = run_once("optimized", images, audio, srt, args.seconds, args.title)
+        print(f"speedup      {after / before:7.2f}x")
+        if args.parallel:
+            par = run_once(
+                "parallel", images, audio, srt, args.seconds, args.title, parallel=True
+            )
+            print(f"speedup      {par / before:7.2f}x (parallel)")
+
+
+if __name__ == "__main__":
+    main()
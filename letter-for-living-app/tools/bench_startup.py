@@ -0,0 +1,72 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1]
+
+# Modules app.py now loads on first use; --eager imports them up front to
+# reproduce the old start-up cost for comparison.
+HEAVY_MODULES = ("selenium.webdriver", "numpy", "PIL.Image", "agents.naver_uploader", "agents.shorts_aligner")
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+for name in {eager!r}:
+    __import__(name)
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+resp = client.get({path!r})
+served = time.perf_counter()
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{
+    "import": imported - started,
+    "first_request": served - started,
+    "status": resp.status_code,
+    "heavy_loaded": heavy,
+}}))
+"""
+
+
+def probe(path: str, eager: bool) -> dict:
+    code = PROBE.format(eager=HEAVY_MODULES if eager else (), path=path, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=APP_DIR, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(label: str, path: str, runs: int, eager: bool) -> dict:
+    samples = [probe(path, eager) for _ in range(runs)]
+    imports = [sample["import"] for sample in samples]
+    firsts = [sample["first_request"] for sample in samples]
+    heavy = samples[-1]["heavy_loaded"]
+    print(
+        f"{label:<6} import {statistics.median(imports) * 1000:7.1f} ms  "
+        f"first {path} {statistics.median(firsts) * 1000:7.1f} ms  "
+        f"(HTTP {samples[-1]['status']}, heavy loaded: {', '.join(heavy) or '없음'})"
+    )
+    return {"import": statistics.median(imports), "first_request": statistics.median(firsts)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure app import time and first-request latency.")
+    parser.add_argument("--runs", type=int, default=5, help="새 프로세스로 측정할 횟수")
+    parser.add_argument("--path", default="/planner")
+    parser.add_argument("--compare", action="store_true", help="무거운 모듈을 먼저 불러온 경우와 비교합니다.")
+    args = parser.parse_args()
+
+    lazy = run("lazy", args.path, args.runs, eager=False)
+    if args.compare:
+        eager = run("eager", args.path, args.runs, eager=True)
+        print(
+            f"saved  import {(eager['import'] - lazy['import']) * 1000:7.1f} ms  "
+            f"first request {(eager['first_request'] - lazy['first_request']) * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
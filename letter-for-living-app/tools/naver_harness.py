@@ -0,0 +1,191 @@
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+APP_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(APP_DIR))
+
+from PIL import Image  # noqa: E402
+
+from agents.browser_pool import shutdown_pool  # noqa: E402
+from agents.naver_uploader import compute_image_positions, open_naver_writer  # noqa: E402
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "naver_fixture"
+IMAGE_COLORS = ("#c0392b", "#2980b9", "#27ae60", "#8e44ad", "#f39c12")
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    # Serves the SmartEditor stand-in and collects the snapshots it posts
+    # to /report after every edit.
+    reports: dict[str, dict] = {}
+    reports_lock = threading.Lock()
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path != "/report":
+            self.send_error(404)
+            return
+        run = parse_qs(url.query).get("run", ["0"])[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            report = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self.send_error(400)
+            return
+        with self.reports_lock:
+            self.reports[run] = {"received": time.monotonic(), "data": report}
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def start_fixture_server() -> ThreadingHTTPServer:
+    handler = partial(FixtureHandler, directory=str(FIXTURE_DIR))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def wait_for_report(run: str, settle: float = 0.5, timeout: float = 10.0) -> dict:
+    # The editor reports on a short debounce; wait until it has gone quiet.
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        with FixtureHandler.reports_lock:
+            entry = FixtureHandler.reports.get(run)
+        if entry and time.monotonic() - entry["received"] >= settle:
+            return entry["data"]
+        time.sleep(0.1)
+    return entry["data"] if entry else {}
+
+
+def make_images(dest_dir: Path, count: int) -> list[str]:
+    paths = []
+    for idx in range(count):
+        path = dest_dir / f"image-{idx + 1}.jpg"
+        Image.new("RGB", (1080, 1080), IMAGE_COLORS[idx % len(IMAGE_COLORS)]).save(path, "JPEG")
+        paths.append(str(path))
+    return paths
+
+
+def make_post(paragraph_count: int) -> tuple[str, list[str]]:
+    title = "하루를 여는 말씀 묵상"
+    paragraphs = [
+        f"{idx + 1}번째 문단입니다. 오늘의 말씀을 천천히 읽고 마음에 남은 문장을 적어 봅니다."
+        for idx in range(paragraph_count)
+    ]
+    return title, paragraphs
+
+
+def check_report(report: dict, title: str, paragraphs: list[str], image_count: int) -> list[str]:
+    problems = []
+    if report.get("title") != title:
+        problems.append(f"title={report.get('title')!r}")
+    blocks = report.get("blocks") or []
+    typed = [
+        para["text"]
+        for block in blocks
+        if block["type"] == "text"
+        for para in block["paragraphs"]
+        if para["text"].strip()
+    ]
+    if typed != paragraphs:
+        problems.append(f"paragraphs {len(typed)}/{len(paragraphs)} match={typed == paragraphs}")
+    images = [block for block in blocks if block["type"] == "image"]
+    if len(images) != image_count:
+        problems.append(f"{len(images)}/{image_count} images placed")
+    # Index of the paragraph that follows each image, in document order.
+    placed = []
+    seen = 0
+    for block in blocks:
+        if block["type"] == "image":
+            placed.append(seen)
+        else:
+            seen += sum(1 for para in block["paragraphs"] if para["text"].strip())
+    expected = sorted(set(compute_image_positions(len(paragraphs), image_count)))
+    if placed != expected:
+        problems.append(f"images before paragraphs {placed}, expected {expected}")
+    return problems
+
+
+def layout(report: dict) -> str:
+    parts = []
+    for block in report.get("blocks") or []:
+        if block["type"] == "image":
+            parts.append("[img]")
+        else:
+            count = sum(1 for para in block["paragraphs"] if para["text"].strip())
+            if count:
+                parts.append(f"{count}p")
+    return " ".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run open_naver_writer against a local SmartEditor stand-in and time each post."
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--paragraphs", type=int, default=6)
+    parser.add_argument("--images", type=int, default=3)
+    parser.add_argument("--upload-ms", type=int, default=300, help="가상 업로드 시간(ms)")
+    parser.add_argument("--typing-mode", choices=("paste", "human"), default="paste")
+    parser.add_argument("--headed", action="store_true", help="Chrome 창을 띄워서 실행합니다.")
+    parser.add_argument("--profile-dir", default="", help="기본: 임시 프로필")
+    args = parser.parse_args()
+
+    server = start_fixture_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    title, paragraphs = make_post(args.paragraphs)
+    timings: list[float] = []
+    failures = 0
+    with tempfile.TemporaryDirectory(prefix="lfl-naver-") as tmp:
+        tmp_dir = Path(tmp)
+        profile_dir = args.profile_dir or str(tmp_dir / "profile")
+        image_paths = make_images(tmp_dir, args.images)
+        try:
+            for run in range(args.runs):
+                write_url = f"{base_url}/write.html?run={run}&upload_ms={args.upload_ms}"
+                started = time.perf_counter()
+                open_naver_writer(
+                    write_url=write_url,
+                    naver_id="",
+                    naver_password="",
+                    title=title,
+                    body="\n\n".join(paragraphs),
+                    profile_dir=profile_dir,
+                    project_root=APP_DIR,
+                    image_paths=image_paths,
+                    typing_mode=args.typing_mode,
+                    headless=not args.headed,
+                )
+                seconds = time.perf_counter() - started
+                timings.append(seconds)
+                report = wait_for_report(str(run))
+                problems = check_report(report, title, paragraphs, len(image_paths))
+                failures += bool(problems)
+                status = "ok" if not problems else "FAIL " + "; ".join(problems)
+                label = "cold" if run == 0 else "warm"
+                print(f"run {run} ({label})  {seconds:6.2f}s  {layout(report):<28} {status}")
+        finally:
+            shutdown_pool()
+            server.shutdown()
+
+    warm = timings[1:] or timings
+    print(
+        f"{len(timings)} runs  warm median {statistics.median(warm):.2f}s  "
+        f"min {min(warm):.2f}s  max {max(warm):.2f}s  cold {timings[0]:.2f}s"
+    )
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()